@@ -1,13 +1,49 @@
 """Low-level wrapper for Obsidian CLI subprocess calls."""
 
 import asyncio
+import atexit
+import os
+import shlex
 import subprocess
 import shutil
-from typing import Optional
+import sys
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Dict, List, Optional, Sequence, Tuple
 
 
 OBSIDIAN_CMD = "obsidian"
 DEFAULT_TIMEOUT = 30
+# StreamReader buffer for async calls; the 64 KiB default makes the
+# transport pause/resume reading many times on multi-MB search output.
+STREAM_LIMIT = 1024 * 1024
+
+# The Obsidian CLI has no REPL/stdin-loop mode: each invocation is a
+# short-lived client that forwards one command to the running app. There is
+# no long-lived process to keep warm, so every call spawns a fresh child.
+
+# CLI commands that never modify the vault; only these may share a child
+# with an identical call already in flight (see run_obsidian_async).
+READ_ONLY_COMMANDS = frozenset({"daily:read", "search", "tasks", "tags", "tag", "vault"})
+_CallKey = Tuple[Optional[str], Tuple[str, ...]]
+
+# Worker threads for loops that cannot spawn subprocesses; see _fallback_executor()
+DEFAULT_POOL_SIZE = 64
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Concurrent async CLI children per event loop (OBSIDIAN_CLI_CONCURRENCY
+# overrides); further calls queue instead of flooding the machine with
+# processes during a burst of tool calls.
+DEFAULT_CONCURRENCY = max(os.cpu_count() or 4, 4)
+# Per-loop spawn limit and in-flight read-only calls; asyncio primitives are
+# bound to one loop, so each loop gets its own. See _loop_state().
+_loop_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+_NOT_FOUND_MESSAGE = (
+    "Obsidian CLI not found. Make sure Obsidian 1.12+ is installed "
+    "and CLI is enabled in Settings → General → Command line interface."
+)
 
 
 class ObsidianCLIError(Exception):
@@ -19,9 +55,123 @@ class ObsidianCLIError(Exception):
         super().__init__(message)
 
 
+@lru_cache(maxsize=1)
+def _obsidian_path() -> Optional[str]:
+    """Return the absolute path of the CLI binary, or None. Cached after first call."""
+    return shutil.which(OBSIDIAN_CMD)
+
+
 def check_obsidian_available() -> bool:
     """Check if the obsidian CLI binary is available on PATH."""
-    return shutil.which(OBSIDIAN_CMD) is not None
+    return _obsidian_path() is not None
+
+
+def _fallback_executor() -> ThreadPoolExecutor:
+    """Return the shared pool used when the event loop lacks subprocess support.
+
+    Sized by OBSIDIAN_CLI_POOL (default 64) rather than the default
+    executor's min(32, cpu_count + 4), since each worker mostly waits on a
+    child process.
+    """
+    global _executor
+    if _executor is None:
+        workers = int(os.environ.get("OBSIDIAN_CLI_POOL", DEFAULT_POOL_SIZE))
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="obsidian-cli")
+        atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+    return _executor
+
+
+class _SharedCall:
+    """One in-flight read-only child and the number of callers awaiting it."""
+
+    def __init__(self, task: "asyncio.Future[str]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class _LoopState:
+    """Spawn limit and in-flight read-only calls for one event loop."""
+
+    def __init__(self) -> None:
+        limit = int(os.environ.get("OBSIDIAN_CLI_CONCURRENCY", DEFAULT_CONCURRENCY))
+        self.slots = asyncio.Semaphore(limit)
+        self.inflight: Dict[_CallKey, _SharedCall] = {}
+
+
+def _loop_state() -> _LoopState:
+    """Return the _LoopState of the running loop, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        state = _loop_states[loop] = _LoopState()
+    return state
+
+
+def install_pidfd_watcher() -> bool:
+    """Reap async children through pidfds instead of a waitpid thread each.
+
+    On Python 3.10/3.11 the default ThreadedChildWatcher starts one thread
+    per subprocess. PidfdChildWatcher turns each exit into a single epoll
+    event on the loop it is attached to. Call this once at startup, before
+    the serving loop is created: the event loop policy attaches the watcher
+    to that loop when it becomes the main thread's loop. Python 3.12+
+    already reaps through pidfds by default and deprecates the watcher API,
+    so there this does nothing.
+
+    Returns:
+        bool: True if the watcher was installed
+    """
+    if not (
+        sys.platform == "linux"
+        and sys.version_info < (3, 12)
+        and hasattr(asyncio, "PidfdChildWatcher")
+    ):
+        return False
+    try:
+        # pidfd_open needs Linux 5.3+
+        os.close(os.pidfd_open(os.getpid()))
+    except (AttributeError, OSError):
+        return False
+    asyncio.get_event_loop_policy().set_child_watcher(asyncio.PidfdChildWatcher())
+    return True
+
+
+@lru_cache(maxsize=32)
+def _cmd_prefix(vault: Optional[str]) -> Tuple[str, ...]:
+    """Return the argv prefix (binary and vault selector) for a vault.
+
+    Uses the resolved absolute path so exec does not re-walk PATH per call.
+    """
+    binary = _obsidian_path() or OBSIDIAN_CMD
+    # Vault must come before the command
+    return (binary, f"vault={vault}") if vault else (binary,)
+
+
+def _build_cmd(args: Sequence[str], vault: Optional[str]) -> List[str]:
+    """Build the argv list for an Obsidian CLI invocation."""
+    return [*_cmd_prefix(vault), *args]
+
+
+def _decode(data: bytes) -> str:
+    """Decode CLI output in one pass; notes are UTF-8 regardless of locale."""
+    return data.decode("utf-8", "replace") if data else ""
+
+
+def _check_result(returncode: int, stdout: str, stderr: str) -> str:
+    """Return stdout without trailing whitespace, or raise ObsidianCLIError.
+
+    Only trailing whitespace (the CLI's final newline) is dropped, so a note
+    that starts with indentation is returned intact.
+    """
+    if returncode != 0:
+        stderr = stderr.rstrip() if stderr else ""
+        raise ObsidianCLIError(
+            f"Command failed (exit {returncode}): {stderr or stdout.rstrip()}",
+            returncode=returncode,
+            stderr=stderr,
+        )
+
+    return stdout.rstrip() if stdout else ""
 
 
 def run_obsidian(
@@ -42,40 +192,29 @@ def run_obsidian(
     Raises:
         ObsidianCLIError: If the command fails or times out
     """
-    cmd = [OBSIDIAN_CMD]
-
-    # Vault must come before the command
-    if vault:
-        cmd.append(f"vault={vault}")
-
-    cmd.extend(args)
+    cmd = _build_cmd(args, vault)
 
+    # Keep this call "simple" so CPython spawns via vfork and closes
+    # inherited fds with close_range(2): no preexec_fn, no pass_fds, no
+    # start_new_session, no user/group switching. (posix_spawn would need
+    # close_fds=False, which leaks the server's descriptors into the child.)
+    # stdin is /dev/null: over stdio transport our stdin is the MCP stream,
+    # which the child must never read from.
     try:
         result = subprocess.run(
             cmd,
+            stdin=subprocess.DEVNULL,
             capture_output=True,
-            text=True,
             timeout=timeout,
         )
     except subprocess.TimeoutExpired:
         raise ObsidianCLIError(
-            f"Command timed out after {timeout}s: {' '.join(cmd)}"
+            f"Command timed out after {timeout}s: {shlex.join(cmd)}"
         )
     except FileNotFoundError:
-        raise ObsidianCLIError(
-            "Obsidian CLI not found. Make sure Obsidian 1.12+ is installed "
-            "and CLI is enabled in Settings → General → Command line interface."
-        )
-
-    if result.returncode != 0:
-        stderr = result.stderr.strip()
-        raise ObsidianCLIError(
-            f"Command failed (exit {result.returncode}): {stderr or result.stdout.strip()}",
-            returncode=result.returncode,
-            stderr=stderr,
-        )
+        raise ObsidianCLIError(_NOT_FOUND_MESSAGE)
 
-    return result.stdout.strip()
+    return _check_result(result.returncode, _decode(result.stdout), _decode(result.stderr))
 
 
 async def run_obsidian_async(
@@ -85,8 +224,87 @@ async def run_obsidian_async(
 ) -> str:
     """Async version of run_obsidian.
 
-    Wraps the blocking subprocess call in asyncio.to_thread to avoid
-    blocking the event loop in async MCP tool handlers.
+    Spawns the CLI with asyncio.create_subprocess_exec so concurrent calls
+    are multiplexed on the event loop instead of each holding a worker
+    thread for the lifetime of the child process. At most
+    OBSIDIAN_CLI_CONCURRENCY children run at once. Identical read-only
+    commands that overlap share one child; a write command starts a fresh
+    generation, so no read issued after it joins a call started before it.
     """
-    return await asyncio.to_thread(run_obsidian, *args, vault=vault, timeout=timeout)
+    state = _loop_state()
+    if not args or args[0] not in READ_ONLY_COMMANDS:
+        state.inflight.clear()
+        return await _spawn_async(state, args, vault, timeout)
+
+    inflight_key = (vault, tuple(args))
+    call = state.inflight.get(inflight_key)
+    if call is None:
+        call = _SharedCall(asyncio.ensure_future(_spawn_async(state, args, vault, timeout)))
+        state.inflight[inflight_key] = call
+        call.task.add_done_callback(partial(_forget_inflight, state.inflight, inflight_key, call))
+    call.waiters += 1
+    try:
+        # Shielded so one caller being cancelled does not fail the others
+        return await asyncio.shield(call.task)
+    finally:
+        call.waiters -= 1
+        if not call.waiters and not call.task.done():
+            # The last caller was cancelled: cancel the call too, so its child
+            # is killed and its slot freed instead of running to its timeout
+            if state.inflight.get(inflight_key) is call:
+                del state.inflight[inflight_key]
+            call.task.cancel()
+
+
+def _forget_inflight(
+    inflight: Dict[_CallKey, _SharedCall],
+    key: _CallKey,
+    call: _SharedCall,
+    task: "asyncio.Future[str]",
+) -> None:
+    """Drop a finished call from the in-flight table and mark its error as seen."""
+    if inflight.get(key) is call:
+        del inflight[key]
+    if not task.cancelled():
+        # Every waiter may have been cancelled; avoid "exception never retrieved"
+        task.exception()
+
+
+async def _spawn_async(
+    state: _LoopState, args: Sequence[str], vault: Optional[str], timeout: float
+) -> str:
+    """Run one CLI child under the loop's concurrency limit and return its output."""
+    cmd = _build_cmd(args, vault)
+
+    async with state.slots:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=STREAM_LIMIT,
+            )
+        except FileNotFoundError:
+            raise ObsidianCLIError(_NOT_FOUND_MESSAGE)
+        except NotImplementedError:
+            # e.g. SelectorEventLoop on Windows: run the blocking call on a thread
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                _fallback_executor(),
+                partial(run_obsidian, *args, vault=vault, timeout=timeout),
+            )
+
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            raise ObsidianCLIError(
+                f"Command timed out after {timeout}s: {shlex.join(cmd)}"
+            )
+        finally:
+            # Reap the child on timeout or cancellation so it never outlives us
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
 
+    return _check_result(proc.returncode, _decode(stdout), _decode(stderr))
@@ -14,26 +14,69 @@ Required environment variable:
 Can be used alongside or instead of the CLI-based server.py.
 """
 
+import asyncio
 import os
 import sys
 import re
 import json
+import time
 import logging
+import sqlite3
+import stat
+import tempfile
+import threading
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any, Literal
+from typing import Optional, List, Dict, Any, Awaitable, BinaryIO, Callable, Iterable, Iterator, Literal, Set, Tuple, TypeVar
 from enum import Enum
 from enum import Enum
-from functools import lru_cache
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache, wraps
 
 try:
     import frontmatter
 except ImportError:
     frontmatter = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import regex
+except ImportError:
+    regex = None
+
+if frontmatter is not None:
+    import yaml
+    from frontmatter.default_handlers import YAMLHandler
+
+    class _CYAMLHandler(YAMLHandler):
+        """YAMLHandler that parses with libyaml's C loader when PyYAML has it.
+
+        Frontmatter parsing dominates metadata reads after I/O; the C loader
+        is several times faster than the pure-Python SafeLoader. Falls back
+        to SafeLoader when PyYAML was built without libyaml.
+        """
+
+        def load(self, fm: str, **kwargs: Any) -> Any:
+            kwargs.setdefault("Loader", getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+            return super().load(fm, **kwargs)
+
+    # Swap the instance python-frontmatter detects '---' headers with, so
+    # every frontmatter.load/loads call below picks it up.
+    frontmatter.handlers[:] = [
+        _CYAMLHandler() if type(h) is YAMLHandler else h for h in frontmatter.handlers
+    ]
+
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, Field, ConfigDict
 
+from models import DailyAppendInput
+from vault_index import NoteData, NoteIndex
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
@@ -43,10 +86,67 @@ DEFAULT_DAILY_NOTE_FORMAT = "%Y-%m-%d"
 DEFAULT_DAILY_NOTE_FOLDER = ""
 MAX_SEARCH_RESULTS = 100
 DEFAULT_SEARCH_LIMIT = 20
-WIKILINK_PATTERN = re.compile(r"\[\[([^\]|]+)(?:\|[^\]]+)?\]\]")
-TAG_PATTERN = re.compile(r"(?:^|\s)#([a-zA-Z0-9_\-/]+)", re.MULTILINE)
+# Single pass over a note for both tags and wikilinks: fenced blocks and
+# inline code match first and are skipped, so only the named groups of the
+# last two alternatives yield a #tag or a [[link]] (the alias is dropped).
+# Inline code stops at a line break, so a stray backtick cannot swallow (and
+# rescan) the rest of the note. Compiled with the third-party `regex` engine
+# when installed, which runs this alternation faster than `re`; the simpler
+# patterns below are faster on `re` and stay there.
+_TOKEN_ENGINE = regex if regex is not None else re
+NOTE_TOKEN_PATTERN = _TOKEN_ENGINE.compile(
+    r"```[\s\S]*?```|`[^`\n]+`"
+    r"|(?:^|(?<=\s))#(?P<tag>[a-zA-Z0-9_\-/]+)"
+    r"|\[\[(?P<link>[^\]|]+)(?:\|[^\]]+)?\]\]",
+    _TOKEN_ENGINE.MULTILINE,
+)
 FRONTMATTER_TAG_PATTERN = re.compile(r"^tags:\s*\[?(.*?)\]?\s*$", re.MULTILINE)
-TASK_PATTERN = re.compile(r"^(\s*)-\s\[(.)\]\s+(.*)$")
+# A '---' (YAML) or '+++' (TOML) frontmatter boundary line, as
+# python-frontmatter's handlers recognize them, matched on raw bytes by
+# _read_frontmatter_only.
+FRONTMATTER_DELIMITER = re.compile(rb"^(?:-{3,}|\+{3,})[ \t]*\r?$", re.MULTILINE)
+# Scanned over whole notes, so whitespace classes exclude line breaks ([^\S\r\n])
+# and a trailing \r of CRLF files stays out of the task text.
+TASK_PATTERN = re.compile(
+    r"^([^\S\r\n]*)-[^\S\r\n]\[([^\r\n])\][^\S\r\n]+([^\r\n]*)", re.MULTILINE
+)
+
+# Per-directory listings for _iter_notes: path -> (mtime_ns, scanned_at_ns,
+# sorted (name, is_folder) entries). Directory mtimes only change when entries
+# are added, removed or renamed, so unchanged folders skip the scandir.
+# Kept in least-recently-used order and capped at _DIR_CACHE_MAX folders, so
+# listings of deleted or long-unvisited folders do not pile up; scans on
+# _EXECUTOR threads update it under _DIR_CACHE_LOCK.
+_DIR_CACHE: "OrderedDict[str, Tuple[int, int, List[Tuple[str, bool]]]]" = OrderedDict()
+_DIR_CACHE_MAX = 16384
+_DIR_CACHE_LOCK = threading.Lock()
+# Coarse-timestamp filesystems (e.g. 2s on FAT) can hide a change made right
+# after a scan; listings younger than this relative to the mtime are redone.
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Vault-wide scans read notes on these threads; file reads release the GIL,
+# so cold-cache open/read syscalls overlap instead of running back to back.
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 4) * 4), thread_name_prefix="obsidian-fs"
+)
+# Notes read ahead of the consumer; bounds memory and wasted reads when a
+# search stops early at its result limit.
+READ_AHEAD = 64
+# Directories with more subfolders than this scan them in parallel on a cold
+# walk; below it the thread hand-off outweighs the scandir calls saved.
+_PARALLEL_SCAN_MIN = 4
+
+# Destination folders the move tool has created or found; a repeat move into
+# one skips the mkdir/stat. Entries can go stale (a folder moved or deleted
+# since), so a failed move drops its folder and retries once.
+_KNOWN_DIRS: Set[Path] = set()
+
+# obsidian_vault_info stats one file per note; its totals are reused for this
+# many seconds instead of being recomputed on every call.
+_VAULT_STATS_TTL = 5.0
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
 
 # ---------------------------------------------------------------------------
 # Logging (stderr only for stdio transport)
@@ -81,9 +181,42 @@ class ResponseFormat(str, Enum):
 # ---------------------------------------------------------------------------
 
 
-@lru_cache(maxsize=1)
+def _dumps(obj: Any) -> str:
+    """Serialize a tool response as compact JSON (non-ASCII kept as-is).
+
+    Uses orjson when installed. Values and keys JSON cannot represent
+    natively (e.g. YAML dates in frontmatter) are converted with str().
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    try:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+    except TypeError:
+        # json rejects dict keys it cannot represent; orjson's OPT_NON_STR_KEYS stringifies them
+        return json.dumps(_json_keys(obj), ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _json_keys(obj: Any) -> Any:
+    """Copy obj with every dict key json.dumps rejects converted with str()."""
+    if isinstance(obj, dict):
+        return {
+            k if k is None or isinstance(k, (str, int, float)) else str(k): _json_keys(v)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return [_json_keys(v) for v in obj]
+    return obj
+
+
+@cache
 def _vault_path() -> Path:
-    """Return the validated vault path. Cached after first call."""
+    """Return the validated vault path. Cached after first call.
+
+    Call _vault_path.cache_clear() after changing OBSIDIAN_VAULT_PATH.
+    """
     vault_path_str = os.environ.get("OBSIDIAN_VAULT_PATH", "")
     if not vault_path_str:
         raise ValueError(
@@ -102,71 +235,471 @@ def _safe_resolve(vault: Path, relative: str) -> Path:
     Note: symlinks within the vault that point outside are resolved and
     will be rejected by is_relative_to(). This is intentional.
     """
+    # Lexical escapes (absolute paths, leading '..') are rejected without
+    # touching the filesystem; anything else still goes through resolve(),
+    # since a symlinked folder at any depth can point outside the vault.
+    normalized = os.path.normpath(relative)
+    if os.path.isabs(normalized) or normalized == os.pardir or normalized.startswith(os.pardir + os.sep):
+        raise ValueError(f"Path traversal detected: {relative}")
     resolved = (vault / relative).resolve()
     if not resolved.is_relative_to(vault):
         raise ValueError(f"Path traversal detected: {relative}")
     return resolved
 
 
-def _is_hidden(path: Path) -> bool:
-    """Check if any component of the path starts with '.' (hidden files/folders)."""
-    return any(part.startswith(".") for part in path.parts)
+_SEP_DOT = os.sep + "."
+
+
+def _is_hidden_name(name: str) -> bool:
+    """Check if a single file or folder name is hidden (starts with '.')."""
+    return name.startswith(".")
+
+
+def _is_hidden(rel_path: str) -> bool:
+    """Check if any component of a vault-relative path starts with '.'.
+
+    Two substring scans on the string instead of building Path.parts.
+    """
+    return rel_path.startswith(".") or _SEP_DOT in rel_path
+
+
+def _scan_dir(directory: str) -> List[Tuple[str, bool]]:
+    """Return the sorted (name, is_folder) entries of one directory level.
+
+    Only notes and folders are listed; hidden entries are skipped and
+    symlinked folders are not followed. The listing is cached per directory
+    and reused while its mtime is unchanged; a listing taken within
+    _RACY_WINDOW_NS of that mtime is not trusted, since a later change in
+    the same timestamp tick would keep it equal.
+    """
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        with _DIR_CACHE_LOCK:
+            _DIR_CACHE.pop(directory, None)
+        raise
+    with _DIR_CACHE_LOCK:
+        cached = _DIR_CACHE.get(directory)
+        if cached:
+            _DIR_CACHE.move_to_end(directory)
+    if cached and cached[0] == mtime_ns and cached[1] - mtime_ns > _RACY_WINDOW_NS:
+        return cached[2]
+    scanned_at = time.time_ns()
+    entries: List[Tuple[str, bool]] = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if _is_hidden_name(entry.name):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    entries.append((entry.name, True))
+                elif entry.name.endswith(".md") and entry.is_file():
+                    entries.append((entry.name, False))
+            except OSError:
+                continue
+    # Match how Path sorts: case-insensitively on Windows, by plain name
+    # elsewhere (names are unique within a directory, so tuples sort by name)
+    if os.name == "nt":
+        entries.sort(key=lambda e: os.path.normcase(e[0]))
+    else:
+        entries.sort()
+    with _DIR_CACHE_LOCK:
+        _DIR_CACHE[directory] = (mtime_ns, scanned_at, entries)
+        _DIR_CACHE.move_to_end(directory)
+        while len(_DIR_CACHE) > _DIR_CACHE_MAX:
+            _DIR_CACHE.popitem(last=False)
+    return entries
+
+
+def _walk_notes(directory: str, entries: Optional[List[Tuple[str, bool]]] = None) -> Iterator[Path]:
+    """Depth-first walk yielding notes in the same order as sorted(Path).
+
+    `entries` is the already scanned listing of `directory`, if any. When a
+    directory has more than _PARALLEL_SCAN_MIN subfolders that were never
+    listed, those are scanned ahead on _EXECUTOR while the walk proceeds in
+    order. Cached subfolders stay serial, where dispatch would cost more
+    than the stat that revalidates them; only changed ones are re-listed.
+    """
+    if entries is None:
+        try:
+            entries = _scan_dir(directory)
+        except OSError:
+            return
+    folders = [os.path.join(directory, name) for name, is_folder in entries if is_folder]
+    uncached = [folder for folder in folders if folder not in _DIR_CACHE]
+    scans = {}
+    if len(uncached) > _PARALLEL_SCAN_MIN:
+        scans = {folder: _EXECUTOR.submit(_scan_dir, folder) for folder in uncached}
+    try:
+        for name, is_folder in entries:
+            path = os.path.join(directory, name)
+            if not is_folder:
+                yield Path(path)
+            elif path in scans:
+                try:
+                    sub_entries = scans.pop(path).result()
+                except OSError:
+                    continue
+                yield from _walk_notes(path, sub_entries)
+            else:
+                yield from _walk_notes(path)
+    finally:
+        for future in scans.values():
+            future.cancel()
+
+
+def _iter_notes(vault: Path, folder: Optional[str] = None) -> Iterator[Path]:
+    """Lazily yield the markdown files in the vault or a specific folder, sorted.
+
+    Only directories whose mtime changed since the last call are re-listed;
+    the rest cost one stat each.
+    """
+    base = _safe_resolve(vault, folder) if folder else vault
+    if base != vault and _is_hidden(str(base.relative_to(vault))):
+        return iter(())
+    return _walk_notes(str(base))
 
 
 def _list_notes(vault: Path, folder: Optional[str] = None) -> List[Path]:
     """List all markdown files in the vault or a specific folder."""
-    base = _safe_resolve(vault, folder) if folder else vault
-    notes = []
-    for p in base.rglob("*.md"):
-        if not _is_hidden(p.relative_to(vault)):
-            notes.append(p)
-    return sorted(notes)
+    return list(_iter_notes(vault, folder))
 
 
-def _strip_code_blocks(content: str) -> str:
-    """Remove fenced code blocks and inline code from content."""
-    content = re.sub(r'```[\s\S]*?```', '', content)
-    content = re.sub(r'`[^`]+`', '', content)
-    return content
+@lru_cache(maxsize=4)
+def _vault_stats(vault: Path, bucket: int) -> Tuple[int, int]:
+    """Return (note count, total size in bytes) for the vault.
 
+    `bucket` is the current _VAULT_STATS_TTL slot of time.monotonic(); a new
+    slot misses the cache, so the totals are at most one TTL old.
+    """
+    count = size = 0
+    for note_path in _iter_notes(vault):
+        try:
+            size += os.stat(note_path).st_size
+        except OSError:
+            continue
+        count += 1
+    return count, size
 
-def _extract_tags(content: str) -> List[str]:
-    """Extract tags from note content (inline #tags and frontmatter tags).
 
-    Strips code blocks first to avoid false positives. Uses lookbehind
-    for whitespace to exclude Markdown headings (# Heading).
+def _prefetch(func: Callable[[_T], _R], items: Iterable[_T], window: int = READ_AHEAD) -> Iterator[Tuple[_T, _R]]:
+    """Yield (item, func(item)) in input order, running func on _EXECUTOR.
+
+    At most `window` calls are in flight. If the consumer stops early, calls
+    that have not started yet are cancelled.
     """
-    tags = set()
-    stripped = _strip_code_blocks(content)
-    for match in TAG_PATTERN.finditer(stripped):
-        tags.add(match.group(1))
-    
-    # Use python-frontmatter if available for robust parsing
+    pending: deque = deque()
+    try:
+        for item in items:
+            pending.append((item, _EXECUTOR.submit(func, item)))
+            if len(pending) >= window:
+                item, future = pending.popleft()
+                yield item, future.result()
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
+def _in_thread(func: Callable[..., _R]) -> Callable[..., Awaitable[_R]]:
+    """Turn a blocking tool body into a coroutine that runs it on a worker thread.
+
+    Used for the read-only tools, whose vault scans would otherwise stall
+    the event loop and every other in-flight call. Mutating tools stay on
+    the loop, which keeps their read-modify-write cycles from interleaving.
+    """
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> _R:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return wrapper
+
+
+@lru_cache(maxsize=256)
+def _compile_query(query: str) -> "re.Pattern[str]":
+    """Compile a literal, case-insensitive search pattern. Cached per query string."""
+    return re.compile(re.escape(query), re.IGNORECASE)
+
+
+def _find_line(f: BinaryIO, line: int) -> Tuple[Optional[int], bytes, int]:
+    """Scan an open note for 1-indexed `line`.
+
+    Returns (offset, content, count): the byte offset and raw bytes of the
+    line (excluding its break), or (None, b"", number of lines) past the end.
+    Lines end at \\r\\n, \\r or \\n, the same breaks obsidian_fs_tasks_list
+    counts after _read_text_with_stat, so both tools number lines alike.
+    Reading stops at the wanted line instead of loading the whole note.
+    """
+    f.seek(0)
+    count = 0
+    pos = 0
+    for piece in f:
+        body = piece[:-1] if piece.endswith(b"\n") else piece
+        if body.endswith(b"\r"):
+            body = body[:-1]
+        start = pos
+        for content in body.split(b"\r"):
+            count += 1
+            if count == line:
+                return start, content, count
+            start += len(content) + 1
+        pos += len(piece)
+    return None, b"", count
+
+
+def _replace_file(path: Path, data: bytes, mode: int) -> None:
+    """Atomically replace path's contents: write a sibling temp file, then os.replace it.
+
+    Readers see either the old or the new note, never a partial write.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, stat.S_IMODE(mode))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _frontmatter_block(content: str) -> str:
+    """Return the raw frontmatter block (without the closing '---'), or ''."""
+    if content.startswith("---"):
+        end = content.find("\n---", 3)
+        if end != -1:
+            return content[:end]
+    return ""
+
+
+def _scan_tokens(content: str) -> Tuple[Set[str], Set[str]]:
+    """Collect inline #tags and [[wikilink]] targets outside code in one pass.
+
+    Requires whitespace before '#' to exclude Markdown headings (# Heading).
+    """
+    tags: Set[str] = set()
+    links: Set[str] = set()
+    for match in NOTE_TOKEN_PATTERN.finditer(content):
+        tag, link = match.group("tag", "link")
+        if tag:
+            tags.add(tag)
+        elif link:
+            links.add(link)
+    return tags, links
+
+
+def _read_frontmatter_only(note_path: Path, block_size: int = 4096) -> str:
+    """Return the note's leading frontmatter block, delimiters included, or ''.
+
+    Reads block_size bytes at a time and stops at the line closing the
+    opening '---' or '+++' fence, so the body of a large note is never
+    read. JSON frontmatter has no such fence, so a note opening with '{'
+    is returned whole. The result parses with frontmatter.loads to the
+    same metadata as the whole file would.
+    """
+    with open(note_path, "rb") as f:
+        data = f.read(block_size)
+        opening = FRONTMATTER_DELIMITER.match(data)
+        if opening is None:
+            return (data + f.read()).decode("utf-8") if data.startswith(b"{") else ""
+        fence = data[:1]
+        while True:
+            closing = next(
+                (m for m in FRONTMATTER_DELIMITER.finditer(data, opening.end()) if m.group().startswith(fence)),
+                None,
+            )
+            # A delimiter at the very end of the buffer may continue in the next block
+            if closing is not None and closing.end() < len(data):
+                return data[:closing.end()].decode("utf-8")
+            block = f.read(block_size)
+            if not block:
+                # Unclosed frontmatter parses as no metadata
+                return data.decode("utf-8") if closing is not None else ""
+            data += block
+
+
+def _load_frontmatter(content: str) -> Any:
+    """Parse the note's frontmatter into a frontmatter.Post, or None if unavailable."""
     if frontmatter:
         try:
-            fm = frontmatter.loads(content)
-            if fm.get("tags"):
-                fm_tags = fm["tags"]
-                if isinstance(fm_tags, list):
-                    tags.update(str(t) for t in fm_tags)
-                elif isinstance(fm_tags, str):
-                    tags.update(t.strip() for t in fm_tags.split(","))
+            return frontmatter.loads(content)
         except Exception:
             pass
-    
-    # Fallback/Supplemental regex for frontmatter (if python-frontmatter failed or not installed)
-    for match in FRONTMATTER_TAG_PATTERN.finditer(content):
+    return None
+
+
+def _frontmatter_tags(content: str, post: Any = None) -> Set[str]:
+    """Extract tags declared in the note's frontmatter.
+
+    `post` is an already parsed frontmatter.Post for this content, if the
+    caller has one; otherwise the content is parsed here. The line regex
+    only runs when YAML parsing is unavailable or failed.
+    """
+    # Use python-frontmatter if available for robust parsing
+    if post is None:
+        post = _load_frontmatter(content)
+    if post is not None:
+        fm_tags = post.get("tags")
+        if isinstance(fm_tags, list):
+            return {str(t) for t in fm_tags}
+        if isinstance(fm_tags, str):
+            return {t.strip() for t in fm_tags.split(",")}
+        return set()
+
+    tags: Set[str] = set()
+    # Fallback regex for frontmatter (if python-frontmatter failed or not installed)
+    for match in FRONTMATTER_TAG_PATTERN.finditer(_frontmatter_block(content)):
         raw = match.group(1)
         for tag in re.split(r"[,\s]+", raw):
             tag = tag.strip().strip("#").strip("'\"" )
             if tag:
                 tags.add(tag)
-    return sorted(tags)
+    return tags
+
+
+def _read_bytes_with_stat(note_path: Path) -> Tuple[bytes, os.stat_result]:
+    """Read a note's raw bytes along with the fstat of the same open file.
+
+    Reads the whole file with one unbuffered os.read sized from fstat
+    instead of going through io's buffered layer (which adds an isatty
+    ioctl, a seek and several block-sized reads).
+    """
+    fd = os.open(note_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        st = os.fstat(fd)
+        data = os.read(fd, st.st_size + 1)
+        # Read on until EOF: FUSE and network filesystems (or a signal) can
+        # return short reads before the end, and the note may have grown
+        # after fstat. Usually this costs one more read that returns b"".
+        if data:
+            chunks = [data]
+            while chunk := os.read(fd, 1 << 16):
+                chunks.append(chunk)
+            if len(chunks) > 1:
+                data = b"".join(chunks)
+    finally:
+        os.close(fd)
+    return data, st
+
+
+def _read_text_with_stat(note_path: Path) -> Tuple[str, os.stat_result]:
+    """Read a note as UTF-8 along with the fstat of the same open file.
+
+    Newlines are translated as text mode would, so CRLF notes still come
+    back with plain \\n.
+    """
+    data, st = _read_bytes_with_stat(note_path)
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text, st
+
+
+def _read_note(note_path: Path) -> Optional[str]:
+    """Read a note as UTF-8, returning None if it is unreadable."""
+    try:
+        return _read_text_with_stat(note_path)[0]
+    except (UnicodeDecodeError, OSError):
+        return None
+
+
+def _read_notes(notes: Iterable[Path]) -> Iterator[Tuple[Path, str]]:
+    """Yield (path, content) for each readable note, reading ahead in parallel."""
+    for note_path, content in _prefetch(_read_note, notes):
+        if content is not None:
+            yield note_path, content
+
+
+def _parse_note(content: str, post: Any = None) -> NoteData:
+    """Extract sorted (tags, wikilinks) from one scan of the note.
+
+    Pass the parsed frontmatter.Post as `post` to avoid parsing the YAML again.
+    """
+    tags, links = _scan_tokens(content)
+    return sorted(tags | _frontmatter_tags(content, post)), sorted(links)
 
 
-def _extract_wikilinks(content: str) -> List[str]:
-    """Extract [[wikilinks]] from note content."""
-    return sorted(set(WIKILINK_PATTERN.findall(content)))
+def _index_unavailable(error: Exception, fallback: str) -> None:
+    """Log why the note index cannot be used before falling back.
+
+    A folder without .obsidian is a supported plain-folder vault rather
+    than a failure, so NoteIndex's FileNotFoundError is only a debug message.
+    """
+    level = logging.DEBUG if isinstance(error, FileNotFoundError) else logging.WARNING
+    logger.log(level, "Note index unavailable, %s: %s", fallback, error)
+
+
+def _indexed_note_data(vault: Path, notes: List[Path], full_vault: bool = False) -> Dict[Path, NoteData]:
+    """Return (tags, wikilinks) for each readable note.
+
+    Uses the on-disk note index so only notes whose mtime or size changed
+    since the last call are read and parsed. Falls back to a direct scan
+    when the index cannot be opened or written (e.g. a read-only vault).
+    """
+    if not notes:
+        return {}
+    try:
+        with NoteIndex(vault) as index:
+            return _refresh_index(index, notes, full_vault)
+    except (sqlite3.Error, OSError) as e:
+        _index_unavailable(e, "scanning directly")
+        return {note_path: _parse_note(content) for note_path, content in _read_notes(notes)}
+
+
+def _refresh_index(index: NoteIndex, notes: List[Path], full_vault: bool, load: bool = True) -> Dict[Path, NoteData]:
+    """Re-parse notes changed since the last call and store them in the index.
+
+    Returns (tags, wikilinks) for every readable note, or only for the
+    re-parsed ones when load is False.
+    """
+    data, stale = index.lookup(notes, load=load)
+    stats = dict(stale)
+    parsed = []
+    for note_path, content in _read_notes(list(stats)):
+        post = _load_frontmatter(content)
+        entry = _parse_note(content, post)
+        data[note_path] = entry
+        properties = _dumps(post.metadata if post is not None else {})
+        parsed.append((note_path, stats[note_path], entry, properties))
+    index.store(parsed)
+    # A changed note that can no longer be read or decoded must not keep
+    # serving its old tags and backlinks
+    index.remove(note_path for note_path in stats if note_path not in data)
+    if full_vault:
+        index.prune(notes)
+    return data
+
+
+def _indexed_frontmatter(vault: Path, notes: List[Path]) -> Dict[Path, Any]:
+    """Return the frontmatter of each readable note, parsing only changed ones.
+
+    Meant for a handful of notes (e.g. search hits): unchanged notes are
+    served from the note index without reading or YAML-parsing them. Falls
+    back to parsing every note when the index is unavailable.
+    """
+    if not notes:
+        return {}
+    try:
+        with NoteIndex(vault) as index:
+            fresh, stale = index.frontmatter(notes)
+            if stale:
+                _refresh_index(index, [note_path for note_path, _ in stale], full_vault=False, load=False)
+                fresh.update(index.frontmatter(note_path for note_path, _ in stale)[0])
+            return fresh
+    except (sqlite3.Error, OSError) as e:
+        _index_unavailable(e, "parsing frontmatter directly")
+        result = {}
+        for note_path in notes:
+            try:
+                post = _load_frontmatter(_read_frontmatter_only(note_path))
+            except (UnicodeDecodeError, OSError):
+                continue
+            result[note_path] = post.metadata if post is not None else {}
+        return result
 
 
 def _resolve_note_path(vault: Path, relative_path: str) -> Path:
@@ -188,28 +721,32 @@ def _resolve_note_path(vault: Path, relative_path: str) -> Path:
     return note_path
 
 
-def _note_metadata(vault: Path, note_path: Path, include_frontmatter: bool = False) -> Dict[str, Any]:
-    """Build metadata dict for a note."""
+def _note_metadata(
+    vault: Path, note_path: Path, include_frontmatter: bool = False, st: Optional[os.stat_result] = None
+) -> Dict[str, Any]:
+    """Build metadata dict for a note.
+
+    Pass `st` when the caller already has a stat of the note (e.g. the
+    fstat of the descriptor it read from) to skip another stat call.
+    """
     rel = note_path.relative_to(vault)
-    stat = note_path.stat()
+    if st is None:
+        st = note_path.stat()
     meta: Dict[str, Any] = {
         "path": str(rel),
         "name": note_path.stem,
         "folder": str(rel.parent) if str(rel.parent) != "." else "",
-        "size_bytes": stat.st_size,
-        "modified": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat(),
+        "size_bytes": st.st_size,
+        "modified": datetime.fromtimestamp(st.st_mtime, tz=timezone.utc).isoformat(),
         # Note: st_ctime is creation time on macOS, but metadata change time on Linux
-        "created": datetime.fromtimestamp(stat.st_ctime, tz=timezone.utc).isoformat(),
+        "created": datetime.fromtimestamp(st.st_ctime, tz=timezone.utc).isoformat(),
     }
     if include_frontmatter:
-        if frontmatter:
-            try:
-                post = frontmatter.load(note_path)
-                meta["frontmatter"] = post.metadata
-            except Exception:
-                meta["frontmatter"] = {}
-        else:
-            meta["frontmatter"] = {}
+        try:
+            post = _load_frontmatter(_read_frontmatter_only(note_path))
+        except (UnicodeDecodeError, OSError):
+            post = None
+        meta["frontmatter"] = post.metadata if post is not None else {}
     return meta
 
 
@@ -218,6 +755,21 @@ def _apply_append(original: str, content: str) -> str:
     return original + "\n" + content
 
 
+def _append_note(note_path: Path, content: str, inline: bool = False) -> Tuple[int, int]:
+    """Append content to the note file in place, returning its size in bytes before and after.
+
+    Unlike _apply_append the note is never read or rewritten, so the cost
+    scales with the appended content only; only use it where plain
+    appending suffices.
+    """
+    added = (content if inline else "\n" + content).encode("utf-8")
+    with open(note_path, "ab") as f:
+        # Append mode opens positioned at the end of the file
+        original_size = f.tell()
+        f.write(added)
+        return original_size, f.tell()
+
+
 def _apply_prepend(original: str, content: str) -> str:
     """Prepend content, respecting frontmatter."""
     if original.startswith("---"):
@@ -251,7 +803,7 @@ def _apply_replace(original: str, content: str, find: Optional[str] = None) -> s
 
 class SearchNotesInput(BaseModel):
     """Input for searching notes by filename or content."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     query: str = Field(..., description="Search query string", min_length=1, max_length=500)
     search_type: Literal["filename", "content", "both"] = Field(
@@ -265,14 +817,14 @@ class SearchNotesInput(BaseModel):
 
 class ReadNoteInput(BaseModel):
     """Input for reading a note."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     path: str = Field(..., description="Relative path to the note (e.g., 'folder/note.md')", min_length=1)
 
 
 class CreateNoteInput(BaseModel):
     """Input for creating a new note."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     path: str = Field(..., description="Relative path for the new note (e.g., 'folder/note.md')", min_length=1)
     content: str = Field(default="", description="Initial content for the note")
@@ -281,13 +833,12 @@ class CreateNoteInput(BaseModel):
 
 class EditNoteInput(BaseModel):
     """Input for editing an existing note."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     path: str = Field(..., description="Relative path to the note", min_length=1)
-    operation: str = Field(
+    operation: Literal["append", "prepend", "replace"] = Field(
         ...,
         description="Edit operation: 'append', 'prepend', or 'replace'",
-        pattern=r"^(append|prepend|replace)$",
     )
     content: str = Field(..., description="Content to add or replace with")
     find: Optional[str] = Field(
@@ -298,7 +849,7 @@ class EditNoteInput(BaseModel):
 
 class DeleteNoteInput(BaseModel):
     """Input for deleting a note."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     path: str = Field(..., description="Relative path to the note to delete", min_length=1)
     confirm: bool = Field(default=False, description="Must be true to confirm deletion")
@@ -306,7 +857,7 @@ class DeleteNoteInput(BaseModel):
 
 class ListFolderInput(BaseModel):
     """Input for listing folder contents."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     folder: Optional[str] = Field(default=None, description="Folder path relative to vault root")
     depth: int = Field(default=2, description="Max depth to list", ge=1, le=5)
@@ -315,7 +866,7 @@ class ListFolderInput(BaseModel):
 
 class GetTagsInput(BaseModel):
     """Input for listing all tags in the vault."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     folder: Optional[str] = Field(default=None, description="Limit to a specific folder")
     response_format: ResponseFormat = Field(default=ResponseFormat.MARKDOWN, description="Output format")
@@ -323,7 +874,7 @@ class GetTagsInput(BaseModel):
 
 class GetBacklinksInput(BaseModel):
     """Input for finding backlinks to a note."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     note_name: str = Field(
         ...,
@@ -335,7 +886,7 @@ class GetBacklinksInput(BaseModel):
 
 class CreateDailyNoteInput(BaseModel):
     """Input for creating a daily note."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     date: Optional[str] = Field(
         default=None,
@@ -351,7 +902,7 @@ class CreateDailyNoteInput(BaseModel):
 
 class FsTasksListInput(BaseModel):
     """Input for listing tasks in the vault."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     folder: Optional[str] = Field(default=None, description="Limit to a specific folder")
     todo: bool = Field(default=False, description="Show only incomplete tasks")
@@ -360,7 +911,7 @@ class FsTasksListInput(BaseModel):
 
 class FsTaskToggleInput(BaseModel):
     """Input for toggling a task status."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     path: str = Field(..., description="Path to the note containing the task")
     line: int = Field(..., description="Line number of the task (1-indexed)", ge=1)
@@ -368,7 +919,7 @@ class FsTaskToggleInput(BaseModel):
 
 class MoveNoteInput(BaseModel):
     """Input for moving or renaming a note/folder."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     source: str = Field(..., description="Current path of the note or folder", min_length=1)
     destination: str = Field(..., description="New path for the note or folder", min_length=1)
@@ -377,17 +928,17 @@ class MoveNoteInput(BaseModel):
 
 class PropertyInput(BaseModel):
     """Input for managing frontmatter properties."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     path: str = Field(..., description="Path to the note", min_length=1)
-    operation: str = Field(..., description="Operation: 'get', 'set', 'remove', 'list'", pattern=r"^(get|set|remove|list)$")
+    operation: Literal["get", "set", "remove", "list"] = Field(..., description="Operation: 'get', 'set', 'remove', 'list'")
     key: Optional[str] = Field(default=None, description="Property key (required for get/set/remove)")
     value: Optional[Any] = Field(default=None, description="Property value (required for set)")
 
 
 class OpenNoteInput(BaseModel):
     """Input for opening a note in the default app."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
 
     path: str = Field(..., description="Path to the note or file to open", min_length=1)
 
@@ -398,7 +949,8 @@ class OpenNoteInput(BaseModel):
 
 
 @mcp.tool(name="obsidian_fs_search")
-async def obsidian_fs_search(params: SearchNotesInput) -> str:
+@_in_thread
+def obsidian_fs_search(params: SearchNotesInput) -> str:
     """Search notes in the Obsidian vault by filename, content, or both.
 
     Args:
@@ -408,36 +960,50 @@ async def obsidian_fs_search(params: SearchNotesInput) -> str:
         str: Search results in the requested format.
     """
     vault = _vault_path()
-    notes = _list_notes(vault, params.folder)
-    query_lower = params.query.lower()
-    results: List[Dict[str, Any]] = []
-
-    for note_path in notes:
-        if len(results) >= params.limit:
+    query_re = _compile_query(params.query)
+    hits: List[Tuple[Path, Dict[str, Any]]] = []
+
+    def _match(note_path: Path) -> Optional[Tuple[str, Optional[os.stat_result]]]:
+        """Return (match_context, stat or None) if the note matches, else None."""
+        if params.search_type in ("filename", "both") and query_re.search(note_path.stem):
+            return "", None
+        if params.search_type == "filename":
+            return None
+        try:
+            content, st = _read_text_with_stat(note_path)
+        except (UnicodeDecodeError, OSError):
+            return None
+        m = query_re.search(content)
+        if not m:
+            return None
+        start = max(0, m.start() - 50)
+        end = min(len(content), m.end() + 50)
+        return content[start:end].replace("\n", " ").strip(), st
+
+    notes = _iter_notes(vault, params.folder)
+    if params.search_type == "filename":
+        matches = ((note_path, _match(note_path)) for note_path in notes)
+    else:
+        # Content reads run ahead on the pool; stopping at the limit cancels the rest
+        matches = _prefetch(_match, notes)
+    for note_path, match in matches:
+        if match is None:
+            continue
+        match_context, st = match
+        meta = _note_metadata(vault, note_path, st=st)
+        meta["match_context"] = match_context
+        hits.append((note_path, meta))
+        if len(hits) >= params.limit:
             break
-        matched = False
-        match_context = ""
-        if params.search_type in ("filename", "both"):
-            if query_lower in note_path.stem.lower():
-                matched = True
-        if params.search_type in ("content", "both") and not matched:
-            try:
-                content = note_path.read_text(encoding="utf-8")
-                if query_lower in content.lower():
-                    matched = True
-                    idx = content.lower().find(query_lower)
-                    start = max(0, idx - 50)
-                    end = min(len(content), idx + len(params.query) + 50)
-                    match_context = content[start:end].replace("\n", " ").strip()
-            except (UnicodeDecodeError, OSError):
-                continue
-        if matched:
-            meta = _note_metadata(vault, note_path, include_frontmatter=True)
-            meta["match_context"] = match_context
-            results.append(meta)
+    # Hits that are unchanged since they were last indexed skip the YAML parse
+    properties = _indexed_frontmatter(vault, [note_path for note_path, _ in hits])
+    results = []
+    for note_path, meta in hits:
+        meta["frontmatter"] = properties.get(note_path, {})
+        results.append(meta)
 
     if params.response_format == ResponseFormat.JSON:
-        return json.dumps({"total": len(results), "query": params.query, "results": results}, indent=2)
+        return _dumps({"total": len(results), "query": params.query, "results": results})
     lines = [f"# Search Results for '{params.query}' ({len(results)} found)\n"]
     for r in results:
         line = f"- **{r['name']}** (`{r['path']}`)"
@@ -448,7 +1014,8 @@ async def obsidian_fs_search(params: SearchNotesInput) -> str:
 
 
 @mcp.tool(name="obsidian_fs_read")
-async def obsidian_fs_read(params: ReadNoteInput) -> str:
+@_in_thread
+def obsidian_fs_read(params: ReadNoteInput) -> str:
     """Read the full content of a note including metadata, tags, and wikilinks.
 
     Args:
@@ -462,26 +1029,19 @@ async def obsidian_fs_read(params: ReadNoteInput) -> str:
     if not note_path.is_file():
         return f"Error: Note not found at '{params.path}'."
     try:
-        content = note_path.read_text(encoding="utf-8")
+        content, st = _read_text_with_stat(note_path)
     except (UnicodeDecodeError, OSError) as e:
         return f"Error: Could not read note: {e}"
-    meta = _note_metadata(vault, note_path)
+    meta = _note_metadata(vault, note_path, st=st)
     meta["content"] = content
     
-    if frontmatter:
-        try:
-            post = frontmatter.loads(content)
-            meta["frontmatter"] = post.metadata
-        except Exception:
-            meta["frontmatter"] = {}
-    else:
-        meta["frontmatter"] = {}
-            
-    meta["tags"] = _extract_tags(content)
-    meta["wikilinks"] = _extract_wikilinks(content)
+    # Parse the frontmatter once; the tag extraction below reuses it
+    post = _load_frontmatter(content)
+    meta["frontmatter"] = post.metadata if post is not None else {}
+    meta["tags"], meta["wikilinks"] = _parse_note(content, post)
     meta["word_count"] = len(content.split())
     meta["char_count"] = len(content)
-    return json.dumps(meta, indent=2, ensure_ascii=False)
+    return _dumps(meta)
 
 
 @mcp.tool(name="obsidian_fs_create")
@@ -507,7 +1067,7 @@ async def obsidian_fs_create(params: CreateNoteInput) -> str:
     except OSError as e:
         return f"Error: Could not create note: {e}"
     rel = note_path.relative_to(vault)
-    return json.dumps({"status": "created", "path": str(rel), "size_bytes": len(params.content.encode("utf-8"))}, indent=2)
+    return _dumps({"status": "created", "path": str(rel), "size_bytes": len(params.content.encode("utf-8"))})
 
 
 @mcp.tool(name="obsidian_fs_edit")
@@ -545,7 +1105,7 @@ async def obsidian_fs_edit(params: EditNoteInput) -> str:
         note_path.write_text(new_content, encoding="utf-8")
     except OSError as e:
         return f"Error: Could not write note: {e}"
-    return json.dumps({"status": "edited", "path": str(note_path.relative_to(vault)), "operation": params.operation, "original_size": len(original), "new_size": len(new_content)}, indent=2)
+    return _dumps({"status": "edited", "path": str(note_path.relative_to(vault)), "operation": params.operation, "original_size": len(original), "new_size": len(new_content)})
 
 
 @mcp.tool(name="obsidian_fs_delete")
@@ -569,11 +1129,12 @@ async def obsidian_fs_delete(params: DeleteNoteInput) -> str:
         note_path.unlink()
     except OSError as e:
         return f"Error: Could not delete note: {e}"
-    return json.dumps({"status": "deleted", "path": rel}, indent=2)
+    return _dumps({"status": "deleted", "path": rel})
 
 
 @mcp.tool(name="obsidian_fs_list_folder")
-async def obsidian_fs_list_folder(params: ListFolderInput) -> str:
+@_in_thread
+def obsidian_fs_list_folder(params: ListFolderInput) -> str:
     """List the folder structure and notes in the vault.
 
     Args:
@@ -587,26 +1148,30 @@ async def obsidian_fs_list_folder(params: ListFolderInput) -> str:
     if not base.is_dir():
         return f"Error: Folder not found: '{params.folder}'"
 
-    def _walk(directory: Path, current_depth: int) -> List[Dict[str, Any]]:
+    def _walk(directory: str, rel_dir: str, current_depth: int) -> List[Dict[str, Any]]:
+        # DirEntry caches the file type from readdir, so is_dir() costs no
+        # extra stat except for symlinks; the parent is known to be visible,
+        # so only each entry's own name needs the hidden check.
         items = []
         try:
-            entries = sorted(directory.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower()))
+            with os.scandir(directory) as it:
+                entries = [e for e in it if not _is_hidden_name(e.name)]
+            entries.sort(key=lambda e: (not e.is_dir(), e.name.lower()))
         except OSError:
             return items
         for entry in entries:
-            rel = entry.relative_to(vault)
-            if _is_hidden(rel):
-                continue
+            rel = os.path.join(rel_dir, entry.name)
             if entry.is_dir():
-                children = _walk(entry, current_depth + 1) if current_depth < params.depth else []
-                items.append({"type": "folder", "name": entry.name, "path": str(rel), "children": children})
-            elif entry.suffix == ".md":
-                items.append({"type": "note", "name": entry.stem, "path": str(rel)})
+                children = _walk(entry.path, rel, current_depth + 1) if current_depth < params.depth else []
+                items.append({"type": "folder", "name": entry.name, "path": rel, "children": children})
+            elif entry.name.endswith(".md"):
+                items.append({"type": "note", "name": entry.name[:-3], "path": rel})
         return items
 
-    tree = _walk(base, 1)
+    rel_base = str(base.relative_to(vault)) if base != vault else ""
+    tree = [] if _is_hidden(rel_base) else _walk(str(base), rel_base, 1)
     if params.response_format == ResponseFormat.JSON:
-        return json.dumps({"root": params.folder or "/", "items": tree}, indent=2, ensure_ascii=False)
+        return _dumps({"root": params.folder or "/", "items": tree})
 
     def _render_tree(items: List[Dict], indent: int = 0) -> List[str]:
         lines = []
@@ -624,7 +1189,8 @@ async def obsidian_fs_list_folder(params: ListFolderInput) -> str:
 
 
 @mcp.tool(name="obsidian_fs_get_tags")
-async def obsidian_fs_get_tags(params: GetTagsInput) -> str:
+@_in_thread
+def obsidian_fs_get_tags(params: GetTagsInput) -> str:
     """Get all tags used across notes in the vault with counts.
 
     Args:
@@ -636,16 +1202,12 @@ async def obsidian_fs_get_tags(params: GetTagsInput) -> str:
     vault = _vault_path()
     notes = _list_notes(vault, params.folder)
     tag_counts: Dict[str, int] = {}
-    for note_path in notes:
-        try:
-            content = note_path.read_text(encoding="utf-8")
-            for tag in _extract_tags(content):
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
-        except (UnicodeDecodeError, OSError):
-            continue
+    for tags, _ in _indexed_note_data(vault, notes, full_vault=not params.folder).values():
+        for tag in tags:
+            tag_counts[tag] = tag_counts.get(tag, 0) + 1
     sorted_tags = sorted(tag_counts.items(), key=lambda x: (-x[1], x[0]))
     if params.response_format == ResponseFormat.JSON:
-        return json.dumps({"total_tags": len(sorted_tags), "tags": [{"tag": t, "count": c} for t, c in sorted_tags]}, indent=2)
+        return _dumps({"total_tags": len(sorted_tags), "tags": [{"tag": t, "count": c} for t, c in sorted_tags]})
     lines = [f"# Tags ({len(sorted_tags)} found)\n"]
     for tag, count in sorted_tags:
         lines.append(f"- #{tag} ({count} notes)")
@@ -653,7 +1215,8 @@ async def obsidian_fs_get_tags(params: GetTagsInput) -> str:
 
 
 @mcp.tool(name="obsidian_fs_get_backlinks")
-async def obsidian_fs_get_backlinks(params: GetBacklinksInput) -> str:
+@_in_thread
+def obsidian_fs_get_backlinks(params: GetBacklinksInput) -> str:
     """Find all notes that link to a specific note via [[wikilinks]].
 
     Args:
@@ -664,24 +1227,70 @@ async def obsidian_fs_get_backlinks(params: GetBacklinksInput) -> str:
     """
     vault = _vault_path()
     notes = _list_notes(vault)
-    target = params.note_name.lower()
+    try:
+        if not notes:
+            sources = []
+        else:
+            with NoteIndex(vault) as index:
+                _refresh_index(index, notes, full_vault=True, load=False)
+                sources = sorted(vault / rel for rel in index.linking_to(params.note_name))
+    except (sqlite3.Error, OSError) as e:
+        _index_unavailable(e, "scanning directly")
+        target = params.note_name.lower()
+        sources = [
+            note_path for note_path, content in _read_notes(notes)
+            if any(link.lower() == target for link in _parse_note(content)[1])
+        ]
     backlinks: List[Dict[str, Any]] = []
-    for note_path in notes:
+    for note_path in sources:
         try:
-            content = note_path.read_text(encoding="utf-8")
-            links = _extract_wikilinks(content)
-            if any(link.lower() == target for link in links):
-                backlinks.append(_note_metadata(vault, note_path))
-        except (UnicodeDecodeError, OSError):
+            backlinks.append(_note_metadata(vault, note_path))
+        except OSError:
             continue
     if params.response_format == ResponseFormat.JSON:
-        return json.dumps({"target": params.note_name, "total": len(backlinks), "backlinks": backlinks}, indent=2)
+        return _dumps({"target": params.note_name, "total": len(backlinks), "backlinks": backlinks})
     lines = [f"# Backlinks to '{params.note_name}' ({len(backlinks)} found)\n"]
     for bl in backlinks:
         lines.append(f"- **{bl['name']}** (`{bl['path']}`)")
     return "\n".join(lines) if backlinks else f"No backlinks found for '{params.note_name}'."
 
 
+def _daily_note_path(vault: Path, dt: datetime, folder: Optional[str] = None) -> Tuple[str, Path]:
+    """Return the (vault-relative, absolute) path of the daily note for a date."""
+    filename = dt.strftime(DEFAULT_DAILY_NOTE_FORMAT) + ".md"
+    folder = folder or DEFAULT_DAILY_NOTE_FOLDER
+    rel_path = f"{folder}/{filename}" if folder else filename
+    return rel_path, _safe_resolve(vault, rel_path)
+
+
+def _write_daily_note(vault: Path, note_path: Path, dt: datetime, template: Optional[str] = None) -> None:
+    """Create a daily note, filled from the template note if it is readable."""
+    content = f"# {dt.strftime('%Y-%m-%d %A')}\n\n"
+    if template is not None:
+        template_path = _safe_resolve(vault, str(template))
+        if template_path.is_file():
+            try:
+                tmpl = template_path.read_text(encoding="utf-8")
+                content = tmpl.replace("{{date}}", dt.strftime("%Y-%m-%d"))
+                content = content.replace("{{title}}", dt.strftime("%Y-%m-%d %A"))
+            except (UnicodeDecodeError, OSError):
+                pass
+    note_path.parent.mkdir(parents=True, exist_ok=True)
+    note_path.write_text(content, encoding="utf-8")
+
+
+def _ensure_daily_note_path(vault: Path) -> Tuple[str, Path]:
+    """Return today's daily note paths, creating the note if it is missing.
+
+    Unlike obsidian_fs_daily_note, an existing note is not read.
+    """
+    dt = datetime.now()
+    rel_path, note_path = _daily_note_path(vault, dt)
+    if not note_path.exists():
+        _write_daily_note(vault, note_path, dt)
+    return rel_path, note_path
+
+
 @mcp.tool(name="obsidian_fs_daily_note")
 async def obsidian_fs_daily_note(params: CreateDailyNoteInput) -> str:
     """Create a daily note for the specified date (defaults to today).
@@ -701,36 +1310,23 @@ async def obsidian_fs_daily_note(params: CreateDailyNoteInput) -> str:
             return "Error: Invalid date format. Use YYYY-MM-DD."
     else:
         dt = datetime.now()
-    filename = dt.strftime(DEFAULT_DAILY_NOTE_FORMAT) + ".md"
-    folder = params.folder or DEFAULT_DAILY_NOTE_FOLDER
-    rel_path = f"{folder}/{filename}" if folder else filename
-    note_path = _safe_resolve(vault, rel_path)
+    rel_path, note_path = _daily_note_path(vault, dt, params.folder)
     if note_path.exists():
         try:
             content = note_path.read_text(encoding="utf-8")
         except (UnicodeDecodeError, OSError) as e:
             return f"Error: Could not read existing daily note: {e}"
-        return json.dumps({"status": "already_exists", "path": rel_path, "content": content}, indent=2, ensure_ascii=False)
-    content = f"# {dt.strftime('%Y-%m-%d %A')}\n\n"
-    if params.template is not None:
-        template_path = _safe_resolve(vault, str(params.template))
-        if template_path.is_file():
-            try:
-                tmpl = template_path.read_text(encoding="utf-8")
-                content = tmpl.replace("{{date}}", dt.strftime("%Y-%m-%d"))
-                content = content.replace("{{title}}", dt.strftime("%Y-%m-%d %A"))
-            except (UnicodeDecodeError, OSError):
-                pass
+        return _dumps({"status": "already_exists", "path": rel_path, "content": content})
     try:
-        note_path.parent.mkdir(parents=True, exist_ok=True)
-        note_path.write_text(content, encoding="utf-8")
+        _write_daily_note(vault, note_path, dt, params.template)
     except OSError as e:
         return f"Error: Could not create daily note: {e}"
-    return json.dumps({"status": "created", "path": rel_path, "date": dt.strftime("%Y-%m-%d")}, indent=2)
+    return _dumps({"status": "created", "path": rel_path, "date": dt.strftime("%Y-%m-%d")})
 
 
 @mcp.tool(name="obsidian_fs_tasks_list")
-async def obsidian_fs_tasks_list(params: FsTasksListInput) -> str:
+@_in_thread
+def obsidian_fs_tasks_list(params: FsTasksListInput) -> str:
     """List tasks from the vault.
 
     Args:
@@ -740,28 +1336,25 @@ async def obsidian_fs_tasks_list(params: FsTasksListInput) -> str:
         str: List of tasks.
     """
     vault = _vault_path()
-    notes = _list_notes(vault, params.folder)
     tasks = []
 
-    for note_path in notes:
-        try:
-            content = note_path.read_text(encoding="utf-8")
-            for i, line in enumerate(content.splitlines(), start=1):
-                match = TASK_PATTERN.match(line)
-                if match:
-                    status = match.group(2)
-                    text = match.group(3)
-                    is_done = status != " "
-                    
-                    if params.todo and is_done:
-                        continue
-                    if params.done and not is_done:
-                        continue
-
-                    rel_path = str(note_path.relative_to(vault))
-                    tasks.append(f"- [{status}] {text} ({rel_path}:{i})")
-        except (UnicodeDecodeError, OSError):
-            continue
+    for note_path, content in _read_notes(_iter_notes(vault, params.folder)):
+        rel_path = None
+        line_no, pos = 1, 0
+        for match in TASK_PATTERN.finditer(content):
+            status = match.group(2)
+            is_done = status != " "
+            if params.todo and is_done:
+                continue
+            if params.done and not is_done:
+                continue
+
+            # Line numbers advance incrementally between matches
+            line_no += content.count("\n", pos, match.start())
+            pos = match.start()
+            if rel_path is None:
+                rel_path = str(note_path.relative_to(vault))
+            tasks.append(f"- [{status}] {match.group(3)} ({rel_path}:{line_no})")
             
     if not tasks:
         return "No tasks found."
@@ -785,34 +1378,55 @@ async def obsidian_fs_task_toggle(params: FsTaskToggleInput) -> str:
         return f"Error: Note not found at '{params.path}'."
 
     try:
-        lines = note_path.read_text(encoding="utf-8").splitlines()
-    except (UnicodeDecodeError, OSError) as e:
+        f = open(note_path, "r+b")
+    except OSError as e:
         return f"Error: Could not read note: {e}"
 
-    if params.line > len(lines):
-        return f"Error: Line {params.line} exceeds file length ({len(lines)} lines)."
+    with f:
+        try:
+            line_start, raw_line, count = _find_line(f, params.line)
+            line_content = raw_line.decode("utf-8")
+        except (UnicodeDecodeError, OSError) as e:
+            return f"Error: Could not read note: {e}"
+
+        if line_start is None:
+            return f"Error: Line {params.line} exceeds file length ({count} lines)."
 
-    target_line_idx = params.line - 1
-    line_content = lines[target_line_idx]
-    match = TASK_PATTERN.match(line_content)
-    
-    if not match:
-        return f"Error: Line {params.line} in {params.path} is not a task."
+        match = TASK_PATTERN.match(line_content)
+        if not match:
+            return f"Error: Line {params.line} in {params.path} is not a task."
+
+        # Only the status character changes; the rest of the note, including
+        # its line endings, stays byte for byte
+        status = match.group(2).encode("utf-8")
+        new_status = b" " if status != b" " else b"x"
+        offset = line_start + len(line_content[:match.start(2)].encode("utf-8"))
+        try:
+            if len(status) == len(new_status):
+                # Same width: patch the byte in place, keeping the inode
+                # (hardlinks, xattrs, ownership) and skipping the rest of the file
+                f.seek(offset)
+                f.write(new_status)
+            else:
+                # A multibyte status shifts everything after it
+                f.seek(0)
+                data = f.read()
+                end = offset + len(status)
+                _replace_file(
+                    note_path, data[:offset] + new_status + data[end:], os.fstat(f.fileno()).st_mode
+                )
+        except OSError as e:
+            return f"Error: Could not write note: {e}"
 
-    indent = match.group(1)
-    status = match.group(2)
-    text = match.group(3)
-    
-    new_status = " " if status != " " else "x"
-    lines[target_line_idx] = f"{indent}- [{new_status}] {text}"
-    
-    try:
-        note_path.write_text("\n".join(lines), encoding="utf-8")
-    except OSError as e:
-        return f"Error: Could not write note: {e}"
-        
     rel_path = str(note_path.relative_to(vault))
-    return f"Toggled task at {rel_path}:{params.line} to [{new_status}]"
+    return f"Toggled task at {rel_path}:{params.line} to [{new_status.decode()}]"
+
+
+def _ensure_dir(directory: Path) -> None:
+    """Create directory (and parents) unless it is already known to exist."""
+    if directory not in _KNOWN_DIRS:
+        directory.mkdir(parents=True, exist_ok=True)
+        _KNOWN_DIRS.add(directory)
 
 
 @mcp.tool(name="obsidian_fs_move")
@@ -851,21 +1465,26 @@ async def obsidian_fs_move(params: MoveNoteInput) -> str:
         return f"Error: Destination already exists: '{params.destination}'. Set overwrite=true to force."
 
     try:
-        dest_path.parent.mkdir(parents=True, exist_ok=True)
-        # shutil.move is safer for cross-filesystem but os.replace is atomic on POSIX
-        # We use renames within valid vault, so path.rename is fine (calls os.rename)
-        # But os.rename fails if dest exists on Windows, os.replace works.
-        # pathlib.Path.replace calls os.replace.
-        src_path.replace(dest_path)
+        _ensure_dir(dest_path.parent)
+        # os.replace is atomic on POSIX and, unlike os.rename, overwrites on Windows
+        try:
+            os.replace(src_path, dest_path)
+        except FileNotFoundError:
+            # The remembered destination folder was removed behind our back
+            if not src_path.exists():
+                raise
+            _KNOWN_DIRS.discard(dest_path.parent)
+            _ensure_dir(dest_path.parent)
+            os.replace(src_path, dest_path)
     except OSError as e:
         return f"Error: Could not move: {e}"
 
 
-    return json.dumps({
+    return _dumps({
         "status": "moved", 
         "from": str(src_path.relative_to(vault)), 
         "to": str(dest_path.relative_to(vault))
-    }, indent=2)
+    })
 
 
 @mcp.tool(name="obsidian_fs_property")
@@ -887,18 +1506,22 @@ async def obsidian_fs_property(params: PropertyInput) -> str:
         return f"Error: Note not found at '{params.path}'."
 
     try:
-        post = frontmatter.load(note_path)
+        # Reading only needs the header; writing re-serializes the whole note
+        if params.operation in ("list", "get"):
+            post = frontmatter.loads(_read_frontmatter_only(note_path))
+        else:
+            post = frontmatter.load(note_path)
     except Exception as e:
         return f"Error: Could not parse frontmatter: {e}"
 
     if params.operation == "list":
-        return json.dumps(post.metadata, indent=2, ensure_ascii=False)
+        return _dumps(post.metadata)
 
     if params.operation == "get":
         if not params.key:
             return "Error: 'key' is required for 'get' operation."
         val = post.metadata.get(params.key)
-        return json.dumps({params.key: val}, indent=2, ensure_ascii=False)
+        return _dumps({params.key: val})
 
     if params.operation == "remove":
         if not params.key:
@@ -910,7 +1533,7 @@ async def obsidian_fs_property(params: PropertyInput) -> str:
                 # But frontmatter.dumps(post) works
                 new_content = frontmatter.dumps(post)
                 note_path.write_text(new_content, encoding="utf-8")
-                return json.dumps({"status": "removed", "key": params.key}, indent=2)
+                return _dumps({"status": "removed", "key": params.key})
             except OSError as e:
                 return f"Error: Could not save note: {e}"
         return f"Error: Property '{params.key}' not found."
@@ -927,7 +1550,7 @@ async def obsidian_fs_property(params: PropertyInput) -> str:
         try:
             new_content = frontmatter.dumps(post)
             note_path.write_text(new_content, encoding="utf-8")
-            return json.dumps({"status": "set", "key": params.key, "value": params.value}, indent=2)
+            return _dumps({"status": "set", "key": params.key, "value": params.value})
         except OSError as e:
             return f"Error: Could not save note: {e}"
 
@@ -969,69 +1592,30 @@ async def obsidian_fs_open(params: OpenNoteInput) -> str:
 # Universal Aliases (Drop-in replacements for server.py tools)
 # ---------------------------------------------------------------------------
 
-@mcp.tool(name="obsidian_search")
-async def alias_obsidian_search(params: SearchNotesInput) -> str:
-    """Alias for obsidian_fs_search."""
-    return await obsidian_fs_search(params)
-
-@mcp.tool(name="obsidian_read")
-async def alias_obsidian_read(params: ReadNoteInput) -> str:
-    """Alias for obsidian_fs_read."""
-    return await obsidian_fs_read(params)
-
-@mcp.tool(name="obsidian_create")
-async def alias_obsidian_create(params: CreateNoteInput) -> str:
-    """Alias for obsidian_fs_create."""
-    return await obsidian_fs_create(params)
-
-@mcp.tool(name="obsidian_edit")
-async def alias_obsidian_edit(params: EditNoteInput) -> str:
-    """Alias for obsidian_fs_edit."""
-    return await obsidian_fs_edit(params)
-
-@mcp.tool(name="obsidian_delete")
-async def alias_obsidian_delete(params: DeleteNoteInput) -> str:
-    """Alias for obsidian_fs_delete."""
-    return await obsidian_fs_delete(params)
-
-@mcp.tool(name="obsidian_list_folder")
-async def alias_obsidian_list_folder(params: ListFolderInput) -> str:
-    """Alias for obsidian_fs_list_folder."""
-    return await obsidian_fs_list_folder(params)
-
-@mcp.tool(name="obsidian_tags_list")
-async def alias_obsidian_tags_list(params: GetTagsInput) -> str:
-    """Alias for obsidian_fs_get_tags. Lists all tags."""
-    return await obsidian_fs_get_tags(params)
-
-@mcp.tool(name="obsidian_backlinks")
-async def alias_obsidian_backlinks(params: GetBacklinksInput) -> str:
-    """Alias for obsidian_fs_get_backlinks."""
-    return await obsidian_fs_get_backlinks(params)
-
-@mcp.tool(name="obsidian_property")
-async def alias_obsidian_property(params: PropertyInput) -> str:
-    """Alias for obsidian_fs_property."""
-    return await obsidian_fs_property(params)
-
-@mcp.tool(name="obsidian_open")
-async def alias_obsidian_open(params: OpenNoteInput) -> str:
-    """Alias for obsidian_fs_open."""
-    return await obsidian_fs_open(params)
-
-@mcp.tool(name="obsidian_tasks_list")
-async def alias_obsidian_tasks_list(params: FsTasksListInput) -> str:
-    """Alias for obsidian_fs_tasks_list."""
-    return await obsidian_fs_tasks_list(params)
-
-@mcp.tool(name="obsidian_task_toggle")
-async def alias_obsidian_task_toggle(params: FsTaskToggleInput) -> str:
-    """Alias for obsidian_fs_task_toggle."""
-    return await obsidian_fs_task_toggle(params)
-
-class DailyAppendInput(BaseModel):
-    """Input for appending to daily note."""
-    content: str = Field(..., description="Content to append")
+def _register_aliases(aliases: Iterable[Tuple[str, Callable[..., Awaitable[str]]]]) -> None:
+    """Register each FS tool a second time under its server.py name.
+
+    The alias is the FS tool function itself rather than a wrapper
+    coroutine awaiting it.
+    """
+    for alias, tool in aliases:
+        mcp.tool(name=alias)(tool)
+
+
+_register_aliases((
+    ("obsidian_search", obsidian_fs_search),
+    ("obsidian_read", obsidian_fs_read),
+    ("obsidian_create", obsidian_fs_create),
+    ("obsidian_edit", obsidian_fs_edit),
+    ("obsidian_delete", obsidian_fs_delete),
+    ("obsidian_list_folder", obsidian_fs_list_folder),
+    ("obsidian_tags_list", obsidian_fs_get_tags),
+    ("obsidian_backlinks", obsidian_fs_get_backlinks),
+    ("obsidian_property", obsidian_fs_property),
+    ("obsidian_open", obsidian_fs_open),
+    ("obsidian_tasks_list", obsidian_fs_tasks_list),
+    ("obsidian_task_toggle", obsidian_fs_task_toggle),
+))
 
 @mcp.tool(name="obsidian_daily_read")
 async def alias_obsidian_daily_read() -> str:
@@ -1041,29 +1625,31 @@ async def alias_obsidian_daily_read() -> str:
 @mcp.tool(name="obsidian_daily_append")
 async def alias_obsidian_daily_append(params: DailyAppendInput) -> str:
     """Append content to today's daily note."""
-    # 1. Ensure exists
-    res_json = await obsidian_fs_daily_note(CreateDailyNoteInput())
-    res = json.loads(res_json)
-    path = res["path"]
-    
-    # 2. Append
-    return await obsidian_fs_edit(EditNoteInput(
-        path=path,
-        operation="append",
-        content=params.content
-    ))
+    # params.vault is accepted for parity with server.py; this server only
+    # serves OBSIDIAN_VAULT_PATH.
+    vault = _vault_path()
+    try:
+        rel_path, note_path = _ensure_daily_note_path(vault)
+    except OSError as e:
+        return f"Error: Could not create daily note: {e}"
+    try:
+        original_bytes, new_bytes = _append_note(note_path, params.content, params.inline)
+    except OSError as e:
+        return f"Error: Could not write note: {e}"
+    return _dumps({"status": "edited", "path": rel_path, "operation": "append", "original_bytes": original_bytes, "new_bytes": new_bytes})
 
 @mcp.tool(name="obsidian_vault_info")
-async def alias_obsidian_vault_info() -> str:
+@_in_thread
+def alias_obsidian_vault_info() -> str:
     """Get vault statistics."""
     vault = _vault_path()
-    notes = _list_notes(vault)
-    return json.dumps({
+    total_notes, total_size = _vault_stats(vault, int(time.monotonic() // _VAULT_STATS_TTL))
+    return _dumps({
         "name": vault.name,
         "path": str(vault),
-        "total_notes": len(notes),
-        "total_size_bytes": sum(n.stat().st_size for n in notes)
-    }, indent=2)
+        "total_notes": total_notes,
+        "total_size_bytes": total_size
+    })
 
 # ---------------------------------------------------------------------------
 # Entry Point
@@ -0,0 +1,23 @@
+"""Pydantic input models shared by the CLI and filesystem MCP servers."""
+
+from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class VaultMixin(BaseModel):
+    """Common vault parameter."""
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid", frozen=True)
+    vault: Optional[str] = Field(
+        default=None,
+        description="Vault name. Defaults to the active vault if omitted.",
+    )
+
+
+class DailyAppendInput(VaultMixin):
+    """Input for appending content to the daily note."""
+    content: str = Field(
+        ..., description="Text to append to the daily note.", min_length=1
+    )
+    inline: bool = Field(
+        default=False, description="If true, append without a leading newline."
+    )
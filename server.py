@@ -1,10 +1,13 @@
 """Obsidian CLI MCP Server - Control Obsidian from Claude."""
 
-from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict
+import functools
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, List, Mapping, Optional, Sequence, Tuple
+from pydantic import BaseModel, Field
 from mcp.server.fastmcp import FastMCP
 
-from cli import run_obsidian_async, ObsidianCLIError
+from cli import install_pidfd_watcher, run_obsidian_async, ObsidianCLIError
+from models import DailyAppendInput, VaultMixin
 
 mcp = FastMCP("obsidian_mcp")
 
@@ -20,34 +23,58 @@ def _error_response(e: Exception) -> str:
     return f"Unexpected error: {type(e).__name__}: {e}"
 
 
-def _vault_args(vault: Optional[str]) -> dict:
-    """Build vault kwarg for run_obsidian."""
-    return {"vault": vault} if vault else {}
+# Shared, read-only result of _vault_args() for the default vault
+_NO_VAULT_ARGS: Mapping[str, str] = MappingProxyType({})
 
 
-# ---------------------------------------------------------------------------
-# Input models
-# ---------------------------------------------------------------------------
+def _vault_args(vault: Optional[str]) -> Mapping[str, str]:
+    """Build vault kwarg for run_obsidian.
 
-class VaultMixin(BaseModel):
-    """Common vault parameter."""
-    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
-    vault: Optional[str] = Field(
-        default=None,
-        description="Vault name. Defaults to the active vault if omitted.",
-    )
+    The common no-vault case returns one shared empty mapping; it is
+    read-only, as callers only unpack it with **.
+    """
+    return {"vault": vault} if vault else _NO_VAULT_ARGS
 
 
-class DailyAppendInput(VaultMixin):
-    """Input for appending content to the daily note."""
-    content: str = Field(
-        ..., description="Text to append to the daily note.", min_length=1
-    )
-    inline: bool = Field(
-        default=False, description="If true, append without a leading newline."
-    )
+# (field, arg template) pairs for optional CLI flags, in CLI argument order.
+# Each field that is set on the params renders as template.format(value).
+_ArgSpec = Sequence[Tuple[str, str]]
+
+_DAILY_APPEND_FLAGS: _ArgSpec = (("inline", "inline"),)
+_TASKS_FLAGS: _ArgSpec = (
+    ("file", "file={}"),
+    ("all_vault", "all"),
+    ("daily", "daily"),
+    ("todo", "todo"),
+    ("done", "done"),
+)
+_SEARCH_FLAGS: _ArgSpec = (
+    ("path", "path={}"),
+    ("limit", "limit={}"),
+    ("matches", "matches"),
+)
 
 
+def _flag_args(params: BaseModel, spec: _ArgSpec) -> List[str]:
+    """Render the set (truthy) fields of params named in spec as CLI args."""
+    return [template.format(value) for name, template in spec if (value := getattr(params, name))]
+
+
+def _safe_call(func: Callable[[Any], Awaitable[str]]) -> Callable[[Any], Awaitable[str]]:
+    """Wrap a tool so an ObsidianCLIError becomes an error response string."""
+    @functools.wraps(func)
+    async def wrapper(params: Any) -> str:
+        try:
+            return await func(params)
+        except ObsidianCLIError as e:
+            return _error_response(e)
+    return wrapper
+
+
+# ---------------------------------------------------------------------------
+# Input models
+# ---------------------------------------------------------------------------
+
 class TasksListInput(VaultMixin):
     """Input for listing tasks."""
     file: Optional[str] = Field(default=None, description="Filter by file name.")
@@ -93,32 +120,26 @@ class TagInfoInput(VaultMixin):
 # ---------------------------------------------------------------------------
 
 @mcp.tool(name="obsidian_daily_read")
+@_safe_call
 async def obsidian_daily_read(params: VaultMixin) -> str:
     """Read the contents of today's daily note.
 
     Returns the full text of the daily note. Creates it first if it
     does not exist yet (using the configured daily note template).
     """
-    try:
-        return await run_obsidian_async("daily:read", **_vault_args(params.vault))
-    except ObsidianCLIError as e:
-        return _error_response(e)
+    return await run_obsidian_async("daily:read", **_vault_args(params.vault))
 
 
 @mcp.tool(name="obsidian_daily_append")
+@_safe_call
 async def obsidian_daily_append(params: DailyAppendInput) -> str:
     """Append text to today's daily note.
 
     Use this to add tasks, notes, or any content to the end of
     the daily note. Supports markdown and \\n for newlines.
     """
-    try:
-        args = ["daily:append", f'content={params.content}', "silent"]
-        if params.inline:
-            args.append("inline")
-        return await run_obsidian_async(*args, **_vault_args(params.vault)) or "Content appended to daily note."
-    except ObsidianCLIError as e:
-        return _error_response(e)
+    args = ("daily:append", f'content={params.content}', "silent", *_flag_args(params, _DAILY_APPEND_FLAGS))
+    return await run_obsidian_async(*args, **_vault_args(params.vault)) or "Content appended to daily note."
 
 
 # ---------------------------------------------------------------------------
@@ -126,36 +147,21 @@ async def obsidian_daily_append(params: DailyAppendInput) -> str:
 # ---------------------------------------------------------------------------
 
 @mcp.tool(name="obsidian_tasks_list")
+@_safe_call
 async def obsidian_tasks_list(params: TasksListInput) -> str:
     """List tasks from the vault, a specific file, or the daily note.
 
     Supports filtering by completion status (todo/done) and by file.
     """
-    try:
-        args = ["tasks"]
-        if params.file:
-            args.append(f"file={params.file}")
-        if params.all_vault:
-            args.append("all")
-        if params.daily:
-            args.append("daily")
-        if params.todo:
-            args.append("todo")
-        if params.done:
-            args.append("done")
-        args.append("verbose")
-        return await run_obsidian_async(*args, **_vault_args(params.vault))
-    except ObsidianCLIError as e:
-        return _error_response(e)
+    args = ("tasks", *_flag_args(params, _TASKS_FLAGS), "verbose")
+    return await run_obsidian_async(*args, **_vault_args(params.vault))
 
 
 @mcp.tool(name="obsidian_task_toggle")
+@_safe_call
 async def obsidian_task_toggle(params: TaskToggleInput) -> str:
     """Toggle a task between complete and incomplete."""
-    try:
-        return await run_obsidian_async("task", f"ref={params.ref}", "toggle", **_vault_args(params.vault))
-    except ObsidianCLIError as e:
-        return _error_response(e)
+    return await run_obsidian_async("task", f"ref={params.ref}", "toggle", **_vault_args(params.vault))
 
 
 # ---------------------------------------------------------------------------
@@ -163,22 +169,14 @@ async def obsidian_task_toggle(params: TaskToggleInput) -> str:
 # ---------------------------------------------------------------------------
 
 @mcp.tool(name="obsidian_search")
+@_safe_call
 async def obsidian_search(params: SearchInput) -> str:
     """Search the vault for text.
 
     Returns matching files and optionally match context.
     """
-    try:
-        args = ["search", f"query={params.query}"]
-        if params.path:
-            args.append(f"path={params.path}")
-        if params.limit:
-            args.append(f"limit={params.limit}")
-        if params.matches:
-            args.append("matches")
-        return await run_obsidian_async(*args, **_vault_args(params.vault))
-    except ObsidianCLIError as e:
-        return _error_response(e)
+    args = ("search", f"query={params.query}", *_flag_args(params, _SEARCH_FLAGS))
+    return await run_obsidian_async(*args, **_vault_args(params.vault))
 
 
 # ---------------------------------------------------------------------------
@@ -186,22 +184,18 @@ async def obsidian_search(params: SearchInput) -> str:
 # ---------------------------------------------------------------------------
 
 @mcp.tool(name="obsidian_tags_list")
+@_safe_call
 async def obsidian_tags_list(params: TagsListInput) -> str:
     """List all tags in the vault with occurrence counts."""
-    try:
-        return await run_obsidian_async("tags", "all", "counts", **_vault_args(params.vault))
-    except ObsidianCLIError as e:
-        return _error_response(e)
+    return await run_obsidian_async("tags", "all", "counts", **_vault_args(params.vault))
 
 
 @mcp.tool(name="obsidian_tag_info")
+@_safe_call
 async def obsidian_tag_info(params: TagInfoInput) -> str:
     """Get details about a specific tag, including which files use it."""
-    try:
-        tag = params.name.lstrip("#")
-        return await run_obsidian_async("tag", f"name={tag}", "verbose", **_vault_args(params.vault))
-    except ObsidianCLIError as e:
-        return _error_response(e)
+    tag = params.name.lstrip("#")
+    return await run_obsidian_async("tag", f"name={tag}", "verbose", **_vault_args(params.vault))
 
 
 # ---------------------------------------------------------------------------
@@ -209,12 +203,10 @@ async def obsidian_tag_info(params: TagInfoInput) -> str:
 # ---------------------------------------------------------------------------
 
 @mcp.tool(name="obsidian_vault_info")
+@_safe_call
 async def obsidian_vault_info(params: VaultMixin) -> str:
     """Show vault information (name, path, file/folder counts, size)."""
-    try:
-        return await run_obsidian_async("vault", **_vault_args(params.vault))
-    except ObsidianCLIError as e:
-        return _error_response(e)
+    return await run_obsidian_async("vault", **_vault_args(params.vault))
 
 
 # ---------------------------------------------------------------------------
@@ -223,6 +215,7 @@ async def obsidian_vault_info(params: VaultMixin) -> str:
 
 def main():
     """Entry point for the MCP server."""
+    install_pidfd_watcher()
     mcp.run()
 
 
@@ -0,0 +1,61 @@
+"""Shared fixtures for the unit tests."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from fakes import FakeRunObsidian
+
+
+@pytest.fixture
+def cli(monkeypatch: pytest.MonkeyPatch) -> FakeRunObsidian:
+    """Replace server.run_obsidian_async with a FakeRunObsidian for one test."""
+    fake = FakeRunObsidian()
+    monkeypatch.setattr("server.run_obsidian_async", fake)
+    return fake
+
+
+@pytest.fixture(scope="session")
+def vault_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Write the sample vault once; tests get a copy of it."""
+    template = tmp_path_factory.mktemp("vault_template")
+    # Plain notes (move tests)
+    (template / "Note.md").write_text("Content", encoding="utf-8")
+    (template / "Folder").mkdir()
+    (template / "Folder/SubNote.md").write_text("SubContent", encoding="utf-8")
+    # Mixed tasks
+    (template / "Project.md").write_text(
+        "# Project\n\n- [ ] Task 1\n- [x] Task 2\n- [ ] Task 3\nNot a task\n",
+        encoding="utf-8"
+    )
+    # Todo only
+    (template / "Todo.md").write_text(
+        "- [ ] Buy milk\n- [ ] Call Bob\n",
+        encoding="utf-8"
+    )
+    # Subfolder
+    (template / "Work").mkdir()
+    (template / "Work/Meeting.md").write_text(
+        "- [x] Prepare slides\n",
+        encoding="utf-8"
+    )
+    return template
+
+
+@pytest.fixture
+def mock_vault(tmp_path: Path, vault_template: Path) -> Path:
+    """Create a temporary vault with sample notes.
+
+    A real copy rather than hardlinks, so a test that writes a note in
+    place (e.g. an append) cannot leak into the template through a shared
+    inode.
+    """
+    shutil.copytree(vault_template, tmp_path, dirs_exist_ok=True)
+    return tmp_path
+
+
+@pytest.fixture
+def mock_vault_path(mock_vault: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Point _vault_path at tmp_path."""
+    monkeypatch.setattr("fs_server._vault_path", lambda: mock_vault)
@@ -0,0 +1,22 @@
+"""Test doubles shared by the unit tests."""
+
+from typing import List, Optional, Tuple
+
+
+class FakeRunObsidian:
+    """Stand-in for server.run_obsidian_async that records its calls.
+
+    Each call appends (args, kwargs) to `calls`, then raises `exc` if set
+    or returns `return_value`.
+    """
+
+    def __init__(self) -> None:
+        self.calls: List[Tuple[tuple, dict]] = []
+        self.return_value = ""
+        self.exc: Optional[Exception] = None
+
+    async def __call__(self, *args: str, **kwargs: str) -> str:
+        self.calls.append((args, kwargs))
+        if self.exc is not None:
+            raise self.exc
+        return self.return_value
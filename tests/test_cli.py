@@ -1,20 +1,38 @@
 """Unit tests for cli.py — Low-level Obsidian CLI wrapper."""
 
+import asyncio
 import subprocess
-from unittest.mock import patch, MagicMock
+import sys
+import weakref
+from pathlib import Path
+from unittest.mock import patch, AsyncMock, MagicMock
 
 import pytest
 import pytest_asyncio
 
 from cli import (
+    _cmd_prefix,
+    _obsidian_path,
     check_obsidian_available,
     run_obsidian,
     run_obsidian_async,
     ObsidianCLIError,
     OBSIDIAN_CMD,
+    STREAM_LIMIT,
 )
 
 
+@pytest.fixture(autouse=True)
+def _no_resolved_binary(monkeypatch: pytest.MonkeyPatch):
+    """Keep the cached CLI path from leaking between tests or from the host PATH."""
+    monkeypatch.setattr("cli.shutil.which", lambda cmd: None)
+    _obsidian_path.cache_clear()
+    _cmd_prefix.cache_clear()
+    yield
+    _obsidian_path.cache_clear()
+    _cmd_prefix.cache_clear()
+
+
 # ---------------------------------------------------------------------------
 # check_obsidian_available
 # ---------------------------------------------------------------------------
@@ -34,6 +52,14 @@ class TestCheckObsidianAvailable:
         mock_which.return_value = None
         assert check_obsidian_available() is False
 
+    @patch("cli.shutil.which")
+    def test_lookup_cached(self, mock_which: MagicMock) -> None:
+        """PATH is only walked once."""
+        mock_which.return_value = "/usr/local/bin/obsidian"
+        check_obsidian_available()
+        check_obsidian_available()
+        mock_which.assert_called_once_with(OBSIDIAN_CMD)
+
 
 # ---------------------------------------------------------------------------
 # run_obsidian
@@ -45,22 +71,39 @@ class TestRunObsidian:
 
     @patch("cli.subprocess.run")
     def test_success(self, mock_run: MagicMock) -> None:
-        """Successful CLI call returns stripped stdout."""
+        """Successful CLI call returns stdout with trailing whitespace stripped."""
         mock_run.return_value = MagicMock(
             returncode=0,
-            stdout="  daily note content\n",
-            stderr="",
+            stdout=b"  daily note content\n",
+            stderr=b"",
         )
         result = run_obsidian("daily:read")
-        assert result == "daily note content"
+        assert result == "  daily note content"
         mock_run.assert_called_once()
         cmd = mock_run.call_args[0][0]
         assert cmd == [OBSIDIAN_CMD, "daily:read"]
 
+    @patch("cli.shutil.which", return_value="/opt/bin/obsidian")
+    @patch("cli.subprocess.run")
+    def test_uses_resolved_path(self, mock_run: MagicMock, _which: MagicMock) -> None:
+        """The binary is invoked by its resolved absolute path."""
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"ok", stderr=b"")
+        run_obsidian("vault")
+        assert mock_run.call_args[0][0] == ["/opt/bin/obsidian", "vault"]
+
+    @patch("cli.subprocess.run")
+    def test_output_decoded_as_utf8(self, mock_run: MagicMock) -> None:
+        """Output is read as bytes and decoded as UTF-8, never via the locale."""
+        mock_run.return_value = MagicMock(
+            returncode=0, stdout="日本語ノート".encode("utf-8") + b"\xff", stderr=b""
+        )
+        assert run_obsidian("daily:read") == "日本語ノート\ufffd"
+        assert "text" not in mock_run.call_args[1]
+
     @patch("cli.subprocess.run")
     def test_with_vault(self, mock_run: MagicMock) -> None:
         """Vault argument is placed before the command."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="ok", stderr="")
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"ok", stderr=b"")
         run_obsidian("daily:read", vault="MyVault")
         cmd = mock_run.call_args[0][0]
         assert cmd == [OBSIDIAN_CMD, "vault=MyVault", "daily:read"]
@@ -68,7 +111,7 @@ class TestRunObsidian:
     @patch("cli.subprocess.run")
     def test_multiple_args(self, mock_run: MagicMock) -> None:
         """Multiple arguments are passed through in order."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="ok", stderr="")
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"ok", stderr=b"")
         run_obsidian("search", "query=test", "limit=10", vault="V")
         cmd = mock_run.call_args[0][0]
         assert cmd == [OBSIDIAN_CMD, "vault=V", "search", "query=test", "limit=10"]
@@ -78,8 +121,8 @@ class TestRunObsidian:
         """Non-zero exit code raises ObsidianCLIError with details."""
         mock_run.return_value = MagicMock(
             returncode=1,
-            stdout="",
-            stderr="vault not found",
+            stdout=b"",
+            stderr=b"vault not found",
         )
         with pytest.raises(ObsidianCLIError) as exc_info:
             run_obsidian("vault")
@@ -94,6 +137,14 @@ class TestRunObsidian:
         with pytest.raises(ObsidianCLIError, match="timed out"):
             run_obsidian("daily:read")
 
+    @patch("cli.subprocess.run")
+    def test_timeout_message_is_quoted(self, mock_run: MagicMock) -> None:
+        """Arguments with spaces are shell-quoted in the timeout message."""
+        mock_run.side_effect = subprocess.TimeoutExpired(cmd="obsidian", timeout=30)
+        with pytest.raises(ObsidianCLIError) as exc_info:
+            run_obsidian("search", "query=two words")
+        assert str(exc_info.value).endswith(f"{OBSIDIAN_CMD} search 'query=two words'")
+
     @patch("cli.subprocess.run")
     def test_not_found(self, mock_run: MagicMock) -> None:
         """FileNotFoundError (CLI missing) becomes ObsidianCLIError."""
@@ -104,40 +155,224 @@ class TestRunObsidian:
     @patch("cli.subprocess.run")
     def test_custom_timeout(self, mock_run: MagicMock) -> None:
         """Custom timeout is passed to subprocess.run."""
-        mock_run.return_value = MagicMock(returncode=0, stdout="ok", stderr="")
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"ok", stderr=b"")
         run_obsidian("daily:read", timeout=60)
         _, kwargs = mock_run.call_args
         assert kwargs["timeout"] == 60
 
+    @patch("cli.subprocess.run")
+    def test_stdin_detached(self, mock_run: MagicMock) -> None:
+        """The child never inherits the MCP server's stdin."""
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"ok", stderr=b"")
+        run_obsidian("vault")
+        assert mock_run.call_args[1]["stdin"] == subprocess.DEVNULL
+
 
 # ---------------------------------------------------------------------------
 # run_obsidian_async
 # ---------------------------------------------------------------------------
 
 
+def _fake_process(returncode: int = 0, stdout: bytes = b"", stderr: bytes = b"") -> MagicMock:
+    """Build a stand-in for asyncio.subprocess.Process."""
+    proc = MagicMock()
+    proc.returncode = returncode
+    proc.communicate = AsyncMock(return_value=(stdout, stderr))
+    proc.wait = AsyncMock(return_value=returncode)
+    return proc
+
+
 class TestRunObsidianAsync:
     """Tests for run_obsidian_async() — async wrapper."""
 
     @pytest.mark.asyncio
-    @patch("cli.subprocess.run")
-    async def test_async_returns_same_result(self, mock_run: MagicMock) -> None:
+    @patch("cli.asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    async def test_async_returns_same_result(self, mock_exec: AsyncMock) -> None:
         """Async wrapper returns the same result as sync version."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="async result\n",
-            stderr="",
-        )
+        mock_exec.return_value = _fake_process(stdout=b"async result\n")
         result = await run_obsidian_async("daily:read", vault="V")
         assert result == "async result"
-        cmd = mock_run.call_args[0][0]
-        assert cmd == [OBSIDIAN_CMD, "vault=V", "daily:read"]
+        cmd = mock_exec.call_args[0]
+        assert cmd == (OBSIDIAN_CMD, "vault=V", "daily:read")
+        assert mock_exec.call_args[1]["limit"] == STREAM_LIMIT
+        assert mock_exec.call_args[1]["stdin"] == asyncio.subprocess.DEVNULL
+
+    @pytest.mark.asyncio
+    @patch("cli.asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    async def test_async_propagates_error(self, mock_exec: AsyncMock) -> None:
+        """Non-zero exit code raises ObsidianCLIError with details."""
+        mock_exec.return_value = _fake_process(returncode=1, stderr=b"error msg")
+        with pytest.raises(ObsidianCLIError) as exc_info:
+            await run_obsidian_async("vault")
+        assert exc_info.value.returncode == 1
+        assert exc_info.value.stderr == "error msg"
+
+    @pytest.mark.asyncio
+    @patch("cli.asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    async def test_async_timeout_kills_child(self, mock_exec: AsyncMock) -> None:
+        """A hung child is killed and reaped, then reported as a timeout."""
+        proc = _fake_process()
+        proc.returncode = None
+
+        async def _hang():
+            await asyncio.sleep(10)
+
+        proc.communicate = _hang
+        mock_exec.return_value = proc
+        with pytest.raises(ObsidianCLIError, match="timed out"):
+            await run_obsidian_async("daily:read", timeout=0.01)
+        proc.kill.assert_called_once()
+        proc.wait.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("cli.asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    async def test_async_not_found(self, mock_exec: AsyncMock) -> None:
+        """FileNotFoundError (CLI missing) becomes ObsidianCLIError."""
+        mock_exec.side_effect = FileNotFoundError()
+        with pytest.raises(ObsidianCLIError, match="not found"):
+            await run_obsidian_async("daily:read")
 
     @pytest.mark.asyncio
     @patch("cli.subprocess.run")
-    async def test_async_propagates_error(self, mock_run: MagicMock) -> None:
-        """Async wrapper propagates ObsidianCLIError from sync version."""
-        mock_run.return_value = MagicMock(
-            returncode=1, stdout="", stderr="error msg"
+    @patch("cli.asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    async def test_async_fallback_without_subprocess_support(
+        self, mock_exec: AsyncMock, mock_run: MagicMock
+    ) -> None:
+        """Loops that cannot spawn children fall back to the sync call on a thread."""
+        mock_exec.side_effect = NotImplementedError()
+        mock_run.return_value = MagicMock(returncode=0, stdout=b"threaded\n", stderr=b"")
+        assert await run_obsidian_async("daily:read") == "threaded"
+        assert mock_run.call_args[0][0] == [OBSIDIAN_CMD, "daily:read"]
+
+
+class TestAsyncConcurrency:
+    """Tests for the spawn limit and in-flight sharing of run_obsidian_async()."""
+
+    @pytest.mark.asyncio
+    @patch("cli.asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    async def test_identical_reads_share_one_child(self, mock_exec: AsyncMock) -> None:
+        mock_exec.return_value = _fake_process(stdout=b"tags")
+        results = await asyncio.gather(*(run_obsidian_async("tags", "all") for _ in range(3)))
+        assert results == ["tags"] * 3
+        assert mock_exec.await_count == 1
+
+    @pytest.mark.asyncio
+    @patch("cli.asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    async def test_writes_are_not_shared(self, mock_exec: AsyncMock) -> None:
+        mock_exec.return_value = _fake_process(stdout=b"ok")
+        args = ("daily:append", "content=x", "silent")
+        await asyncio.gather(run_obsidian_async(*args), run_obsidian_async(*args))
+        assert mock_exec.await_count == 2
+
+    @pytest.mark.asyncio
+    @patch("cli.asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    async def test_shared_error_reaches_every_caller(self, mock_exec: AsyncMock) -> None:
+        mock_exec.return_value = _fake_process(returncode=1, stderr=b"bad")
+        results = await asyncio.gather(
+            run_obsidian_async("vault"), run_obsidian_async("vault"), return_exceptions=True
         )
-        with pytest.raises(ObsidianCLIError):
-            await run_obsidian_async("vault")
+        assert all(isinstance(r, ObsidianCLIError) for r in results)
+        assert mock_exec.await_count == 1
+
+    @pytest.mark.asyncio
+    @patch("cli.asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    async def test_cancelled_last_waiter_kills_child(self, mock_exec: AsyncMock) -> None:
+        """Once every caller of a shared read is cancelled, its child is killed."""
+        proc = _fake_process()
+        proc.returncode = None
+        started = asyncio.Event()
+
+        async def _hang():
+            started.set()
+            await asyncio.sleep(10)
+
+        proc.communicate = _hang
+        mock_exec.return_value = proc
+        first = asyncio.ensure_future(run_obsidian_async("search", "query=cancel"))
+        second = asyncio.ensure_future(run_obsidian_async("search", "query=cancel"))
+        await started.wait()
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await asyncio.sleep(0)
+        # Another caller still waits on the shared child
+        proc.kill.assert_not_called()
+
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        for _ in range(3):
+            await asyncio.sleep(0)
+        proc.kill.assert_called_once()
+        proc.wait.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    @patch("cli.asyncio.create_subprocess_exec", new_callable=AsyncMock)
+    async def test_spawn_limit(self, mock_exec: AsyncMock, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("OBSIDIAN_CLI_CONCURRENCY", "2")
+        # The limit is read when a loop's state is first created; the test
+        # loop is shared, so start from fresh per-loop state
+        monkeypatch.setattr("cli._loop_states", weakref.WeakKeyDictionary())
+        running = peak = 0
+
+        async def _spawn(*cmd, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            proc = _fake_process(stdout=b"ok")
+
+            async def _communicate():
+                nonlocal running
+                await asyncio.sleep(0.01)
+                running -= 1
+                return b"ok", b""
+
+            proc.communicate = _communicate
+            return proc
+
+        mock_exec.side_effect = _spawn
+        await asyncio.gather(*(run_obsidian_async("search", f"query={i}") for i in range(5)))
+        assert mock_exec.await_count == 5
+        assert peak == 2
+
+
+# ---------------------------------------------------------------------------
+# install_pidfd_watcher
+# ---------------------------------------------------------------------------
+
+# Runs in a fresh interpreter so the child watcher never touches the test loop
+_SECOND_LOOP_SCRIPT = """
+import asyncio, sys
+import cli
+
+cli.install_pidfd_watcher()
+cli._cmd_prefix = lambda vault: (sys.executable, "-c")
+
+async def serve():
+    slow = asyncio.ensure_future(
+        cli.run_obsidian_async("import time; time.sleep(0.5); print('slow')", timeout=5)
+    )
+    await asyncio.sleep(0.1)
+    # A child spawned from another thread's loop must not re-attach the
+    # watcher and drop the serving loop's pending child
+    other = await asyncio.to_thread(asyncio.run, cli.run_obsidian_async("print('other')", timeout=5))
+    print(other, await asyncio.wait_for(slow, 3))
+
+asyncio.run(serve())
+"""
+
+
+class TestInstallPidfdWatcher:
+    """Tests for install_pidfd_watcher() using real child processes."""
+
+    def test_second_loop_does_not_orphan_children(self) -> None:
+        result = subprocess.run(
+            [sys.executable, "-c", _SECOND_LOOP_SCRIPT],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.split() == ["other", "slow"]
@@ -20,9 +20,13 @@ except ImportError:
     frontmatter = None
 
 
-@pytest.fixture
-def mock_vault(tmp_path: Path) -> Path:
-    """Create a temporary vault with frontmatter notes."""
+@pytest.fixture(scope="module")
+def mock_vault(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a temporary vault with frontmatter notes.
+
+    Built once per module: the tests here only read and search it.
+    """
+    tmp_path = tmp_path_factory.mktemp("frontmatter_vault")
     # Note 1: Full frontmatter
     (tmp_path / "Full.md").write_text(
         "---\n"
@@ -12,22 +12,28 @@ from fs_server import (
 
 # Integration tests using real filesystem (no mocks)
 
+@pytest.fixture(scope="module")
+def shared_vault(tmp_path_factory):
+    """Create one temporary vault for the whole module.
+
+    Each test writes its own note names, so they can share the directory
+    instead of building a fresh vault per test.
+    """
+    return tmp_path_factory.mktemp("test_vault")
+
+
 @pytest.fixture
-def vault_dir(tmp_path, monkeypatch):
-    """Create a temporary vault directory."""
-    vault = tmp_path / "test_vault"
-    vault.mkdir()
-    
+def vault_dir(shared_vault, monkeypatch):
+    """Point the server at the shared vault for one test."""
     # Use monkeypatch for safe environment variable handling
-    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(vault))
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(shared_vault))
     
     # Clear cache to pick up new env var (since fs_server caches it)
     from fs_server import _vault_path
     _vault_path.cache_clear()
     
-    yield vault
-    # Cleanup done by tmp_path, but environment var reset might be needed if running in same process
-    # However, for pytest it's usually fine. We can unset it if strict.
+    yield shared_vault
+    _vault_path.cache_clear()
 
 @pytest.mark.asyncio
 async def test_prepend_with_frontmatter(vault_dir):
@@ -82,7 +88,7 @@ async def test_properties_lifecycle(vault_dir):
     if "python-frontmatter not installed" in res:
         pytest.skip("python-frontmatter not installed; skipping property test")
 
-    assert '"status": "set"' in res
+    assert '"status":"set"' in res
     
     # 3. Get property
     res = await obsidian_fs_property(PropertyInput(path="Props.md", operation="get", key="test_key"))
@@ -96,7 +102,7 @@ async def test_properties_lifecycle(vault_dir):
     
     # 5. Remove property
     res = await obsidian_fs_property(PropertyInput(path="Props.md", operation="remove", key="test_key"))
-    assert '"status": "removed"' in res
+    assert '"status":"removed"' in res
     
     # 6. Verify removal
     res = await obsidian_fs_property(PropertyInput(path="Props.md", operation="get", key="test_key"))
@@ -117,7 +123,7 @@ async def test_properties_types(vault_dir):
     if "python-frontmatter not installed" in res:
         pytest.skip("python-frontmatter not installed; skipping property test")
 
-    assert '"status": "set"' in res
+    assert '"status":"set"' in res
     data = json.loads(await obsidian_fs_property(PropertyInput(path="Types.md", operation="get", key="tags")))
     assert data["tags"] == ["a", "b"]
     
@@ -131,3 +137,83 @@ async def test_properties_types(vault_dir):
     data = json.loads(await obsidian_fs_property(PropertyInput(path="Types.md", operation="get", key="count")))
     assert data["count"] == 42
 
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_orjson", [True, False])
+async def test_read_serializes_yaml_dates(vault_dir, monkeypatch, use_orjson):
+    """YAML dates in frontmatter are serialized instead of failing the response."""
+    import fs_server
+    if use_orjson and fs_server.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(fs_server, "orjson", None)
+    (vault_dir / "Dated.md").write_text("---\ncreated: 2024-01-02\n---\n日本語", encoding="utf-8")
+    res = await obsidian_fs_read(ReadNoteInput(path="Dated.md"))
+    if '"frontmatter":{}' in res:
+        pytest.skip("python-frontmatter not installed")
+    data = json.loads(res)
+    assert data["frontmatter"]["created"] == "2024-01-02"
+    assert "日本語" in res
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_orjson", [True, False])
+async def test_read_serializes_non_str_keys(vault_dir, monkeypatch, use_orjson):
+    """Date and number keys in frontmatter serialize the same with and without orjson."""
+    import fs_server
+    if use_orjson and fs_server.orjson is None:
+        pytest.skip("orjson not installed")
+    if not use_orjson:
+        monkeypatch.setattr(fs_server, "orjson", None)
+    (vault_dir / "Keys.md").write_text("---\nlog:\n  2024-01-02: started\n  1: one\n---\nBody", encoding="utf-8")
+    res = await obsidian_fs_read(ReadNoteInput(path="Keys.md"))
+    if '"frontmatter":{}' in res:
+        pytest.skip("python-frontmatter not installed")
+    assert json.loads(res)["frontmatter"]["log"] == {"2024-01-02": "started", "1": "one"}
+
+
+@pytest.mark.parametrize("text", [
+    "---\ntitle: A\ntags: [x, y]\n---\nBody " + "x" * 100,
+    "---\r\ntitle: CRLF\r\n---\r\nBody",
+    "----\ntitle: Long dashes\n----",
+    "---\ntitle: Unclosed\n",
+    "No frontmatter\n---\ntitle: later\n---\n",
+    "---\ntitle: " + "long " * 40 + "\n---\n",
+    "+++\ntitle = \"TOML\"\n+++\nBody",
+    "+++\nnote = \"\"\"\n---\n\"\"\"\n+++\nBody\n---\n",
+    '{\n"title": "JSON"\n}\nBody',
+])
+@pytest.mark.parametrize("block_size", [7, 4096])
+def test_read_frontmatter_only_matches_full_parse(tmp_path, text, block_size):
+    """Parsing only the header yields the same metadata as the whole note."""
+    frontmatter = pytest.importorskip("frontmatter")
+    from fs_server import _read_frontmatter_only
+    note = tmp_path / "Note.md"
+    note.write_bytes(text.encode("utf-8"))
+    header = _read_frontmatter_only(note, block_size=block_size)
+    assert text.startswith(header)
+    assert frontmatter.loads(header).metadata == frontmatter.loads(text).metadata
+
+
+def test_read_bytes_survives_short_reads(tmp_path, monkeypatch):
+    """A filesystem that returns short reads before EOF still yields the whole note."""
+    import fs_server
+    note = tmp_path / "Note.md"
+    note.write_bytes(b"0123456789" * 10)
+    real_read = os.read
+    monkeypatch.setattr(fs_server.os, "read", lambda fd, n: real_read(fd, min(n, 7)))
+    data, st = fs_server._read_bytes_with_stat(note)
+    assert data == b"0123456789" * 10
+    assert st.st_size == 100
+
+
+def test_frontmatter_yaml_uses_c_loader_with_fallback(monkeypatch):
+    """Frontmatter parses through the C-loader handler, or SafeLoader without libyaml."""
+    frontmatter = pytest.importorskip("frontmatter")
+    import yaml
+    from fs_server import _CYAMLHandler
+    post = frontmatter.loads("---\ntitle: A\n---\nBody")
+    assert isinstance(post.handler, _CYAMLHandler)
+    assert post.metadata == {"title": "A"}
+    monkeypatch.delattr(yaml, "CSafeLoader", raising=False)
+    assert frontmatter.loads("---\ntitle: B\n---\n").metadata == {"title": "B"}
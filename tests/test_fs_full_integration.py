@@ -7,9 +7,10 @@ from datetime import datetime
 from fs_server import (
     obsidian_fs_create, obsidian_fs_read, obsidian_fs_edit, obsidian_fs_delete,
     obsidian_fs_list_folder, obsidian_fs_get_tags, obsidian_fs_get_backlinks,
-    obsidian_fs_daily_note,
+    obsidian_fs_daily_note, obsidian_fs_search,
     CreateNoteInput, ReadNoteInput, EditNoteInput, DeleteNoteInput,
-    ListFolderInput, GetTagsInput, GetBacklinksInput, CreateDailyNoteInput
+    ListFolderInput, GetTagsInput, GetBacklinksInput, CreateDailyNoteInput,
+    SearchNotesInput
 )
 
 @pytest.fixture
@@ -18,21 +19,178 @@ def vault_dir(tmp_path, monkeypatch):
     vault = tmp_path / "test_vault"
     vault.mkdir()
     
-    # Use monkeypatch for safe environment variable handling
-    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(vault))
-    
-    # Clear cache to ensure fs_server picks up the new env var
-    from fs_server import _vault_path
-    _vault_path.cache_clear()
+    # Point fs_server at the vault directly, as the mocked unit tests do,
+    # instead of setting OBSIDIAN_VAULT_PATH and clearing _vault_path's cache
+    monkeypatch.setattr("fs_server._vault_path", lambda: vault)
     
     return vault
 
+class _FrozenDatetime(datetime):
+    """datetime whose now() is fixed, so daily-note names are known up front."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 6, 15, 9, 30, tzinfo=tz)
+
+
+@pytest.fixture
+def frozen_today(monkeypatch):
+    """Freeze fs_server's clock at 2024-06-15 and return that date."""
+    monkeypatch.setattr("fs_server.datetime", _FrozenDatetime)
+    return "2024-06-15"
+
+class TestSafeResolve:
+    def test_inside_vault(self, vault_dir):
+        from fs_server import _safe_resolve
+        assert _safe_resolve(vault_dir, "Folder/../Note.md") == vault_dir / "Note.md"
+
+    @pytest.mark.parametrize("relative", ["../outside.md", "..", "/etc/passwd", "a/../../outside.md"])
+    def test_lexical_escape_rejected(self, vault_dir, relative):
+        from fs_server import _safe_resolve
+        with pytest.raises(ValueError, match="Path traversal"):
+            _safe_resolve(vault_dir, relative)
+
+    def test_symlinked_folder_escape_rejected(self, vault_dir, tmp_path):
+        from fs_server import _safe_resolve
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (vault_dir / "Link").symlink_to(outside)
+        with pytest.raises(ValueError, match="Path traversal"):
+            _safe_resolve(vault_dir, "Link/secret.md")
+
+class TestListNotes:
+    def test_skips_hidden_and_symlinked_folders(self, vault_dir):
+        from fs_server import _list_notes
+        (vault_dir / "A.md").write_text("a")
+        (vault_dir / ".hidden").mkdir()
+        (vault_dir / ".hidden/H.md").write_text("h")
+        (vault_dir / "Sub").mkdir()
+        (vault_dir / "Sub/B.md").write_text("b")
+        (vault_dir / "Link").symlink_to(vault_dir / "Sub")
+        assert _list_notes(vault_dir) == [vault_dir / "A.md", vault_dir / "Sub/B.md"]
+        assert _list_notes(vault_dir, ".hidden") == []
+
+    def test_order_matches_sorted_paths(self, vault_dir):
+        from fs_server import _iter_notes
+        for rel in ["a.md", "a/z.md", "a b.md", "B.md", "a/b/c.md", "a.md.d/x.md", "Z/y.md"]:
+            (vault_dir / rel).parent.mkdir(parents=True, exist_ok=True)
+            (vault_dir / rel).write_text("")
+        assert list(_iter_notes(vault_dir)) == sorted(vault_dir.rglob("*.md"))
+
+    def test_parallel_cold_walk_keeps_order(self, vault_dir):
+        from fs_server import _iter_notes, _PARALLEL_SCAN_MIN
+        for i in range(_PARALLEL_SCAN_MIN + 3):
+            for rel in [f"d{i}/n.md", f"d{i}/sub/m.md", f"d{i}.md"]:
+                (vault_dir / rel).parent.mkdir(parents=True, exist_ok=True)
+                (vault_dir / rel).write_text("")
+        (vault_dir / "d0/.hidden").mkdir()
+        (vault_dir / "d0/.hidden/h.md").write_text("")
+        expected = [p for p in sorted(vault_dir.rglob("*.md")) if ".hidden" not in p.parts]
+        assert list(_iter_notes(vault_dir)) == expected
+        assert list(_iter_notes(vault_dir)) == expected
+
+    def test_parallel_walk_submits_only_uncached_folders(self, vault_dir, monkeypatch):
+        import fs_server
+        (vault_dir / "old").mkdir()
+        (vault_dir / "old/o.md").write_text("")
+        fs_server._list_notes(vault_dir)
+        new = [f"new{i}" for i in range(fs_server._PARALLEL_SCAN_MIN + 1)]
+        for name in new:
+            (vault_dir / name).mkdir()
+            (vault_dir / name / "n.md").write_text("")
+        submitted = []
+        real_submit = fs_server._EXECUTOR.submit
+
+        def submit(fn, folder):
+            submitted.append(os.path.basename(folder))
+            return real_submit(fn, folder)
+
+        monkeypatch.setattr(fs_server._EXECUTOR, "submit", submit)
+        assert fs_server._list_notes(vault_dir) == sorted(vault_dir.rglob("*.md"))
+        assert sorted(submitted) == new
+
+    def test_dir_cache_is_bounded(self, vault_dir, monkeypatch):
+        import fs_server
+        monkeypatch.setattr(fs_server, "_DIR_CACHE_MAX", 3)
+        for i in range(6):
+            (vault_dir / f"d{i}").mkdir()
+            (vault_dir / f"d{i}/n.md").write_text("")
+        expected = sorted(vault_dir.rglob("*.md"))
+        assert fs_server._list_notes(vault_dir) == expected
+        assert len(fs_server._DIR_CACHE) == 3
+        assert fs_server._list_notes(vault_dir) == expected
+
+    def test_cached_listing_sees_changes(self, vault_dir):
+        from fs_server import _list_notes
+        (vault_dir / "Sub").mkdir()
+        (vault_dir / "Sub/B.md").write_text("b")
+        assert _list_notes(vault_dir) == [vault_dir / "Sub/B.md"]
+        (vault_dir / "Sub/C.md").write_text("c")
+        (vault_dir / "Sub/B.md").unlink()
+        assert _list_notes(vault_dir) == [vault_dir / "Sub/C.md"]
+
+    def test_old_listing_reused_until_mtime_changes(self, vault_dir):
+        from fs_server import _list_notes
+        (vault_dir / "A.md").write_text("a")
+        old = 1_000_000_000
+        os.utime(vault_dir, ns=(old, old))
+        assert _list_notes(vault_dir) == [vault_dir / "A.md"]
+        # Same mtime: the cached listing is trusted, so a hidden edit is not seen
+        (vault_dir / "B.md").write_text("b")
+        os.utime(vault_dir, ns=(old, old))
+        assert _list_notes(vault_dir) == [vault_dir / "A.md"]
+        os.utime(vault_dir, ns=(old + 1, old + 1))
+        assert _list_notes(vault_dir) == [vault_dir / "A.md", vault_dir / "B.md"]
+
+@pytest.mark.asyncio
+class TestFsSearch:
+    async def test_search_content_case_insensitive(self, vault_dir):
+        (vault_dir / "Note.md").write_text("Some text about Python (3.11) here")
+        res = await obsidian_fs_search(SearchNotesInput(query="python (3.11)", response_format="json"))
+        data = json.loads(res)
+        assert data["total"] == 1
+        assert "Python (3.11)" in data["results"][0]["match_context"]
+
+    async def test_search_context_around_multibyte_text(self, vault_dir):
+        (vault_dir / "JP.md").write_text("日本語" * 30 + " needle " + "テキスト" * 30, encoding="utf-8")
+        (vault_dir / "Empty.md").write_text("")
+        res = await obsidian_fs_search(SearchNotesInput(query="NEEDLE", response_format="json"))
+        data = json.loads(res)
+        assert data["total"] == 1
+        expected = ("日本語" * 30 + " ")[-50:] + "needle" + (" " + "テキスト" * 30)[:50]
+        assert data["results"][0]["match_context"] == expected
+
+    async def test_search_crlf_and_unicode_case(self, vault_dir):
+        (vault_dir / "Win.md").write_bytes("ÄPFEL line\r\nnext".encode("utf-8"))
+        data = json.loads(await obsidian_fs_search(SearchNotesInput(query="äpfel", response_format="json")))
+        assert data["results"][0]["match_context"] == "ÄPFEL line next"
+        data = json.loads(await obsidian_fs_search(SearchNotesInput(query="LINE", response_format="json")))
+        assert "\r" not in data["results"][0]["match_context"]
+
+    async def test_search_non_ascii_query(self, vault_dir):
+        (vault_dir / "JP.md").write_text("今日は会議があります", encoding="utf-8")
+        res = await obsidian_fs_search(SearchNotesInput(query="会議", search_type="content"))
+        assert "JP" in res
+
+    async def test_search_stops_at_limit(self, vault_dir):
+        for i in range(30):
+            (vault_dir / f"Note{i:02d}.md").write_text("common text")
+        res = await obsidian_fs_search(SearchNotesInput(query="common", limit=5, response_format="json"))
+        data = json.loads(res)
+        assert [r["name"] for r in data["results"]] == [f"Note{i:02d}" for i in range(5)]
+
+    async def test_search_filename_only(self, vault_dir):
+        (vault_dir / "Meeting Notes.md").write_text("nothing")
+        (vault_dir / "Other.md").write_text("meeting")
+        res = await obsidian_fs_search(SearchNotesInput(query="MEETING", search_type="filename"))
+        assert "Meeting Notes" in res
+        assert "Other" not in res
+
 @pytest.mark.asyncio
 class TestFsCreate:
     async def test_create_new_note(self, vault_dir):
         res = await obsidian_fs_create(CreateNoteInput(path="New.md", content="# New"))
-        data = json.loads(res)
-        assert data["status"] == "created"
+        assert '"status":"created"' in res
         assert (vault_dir / "New.md").read_text() == "# New"
 
     async def test_create_existing_fail(self, vault_dir):
@@ -65,6 +223,31 @@ class TestFsRead:
         res = await obsidian_fs_read(ReadNoteInput(path="Missing.md"))
         assert "Error: Note not found" in res
 
+    async def test_read_translates_crlf(self, vault_dir):
+        (vault_dir / "Win.md").write_bytes("# 見出し\r\nline\r\nold mac\rend".encode("utf-8"))
+        data = json.loads(await obsidian_fs_read(ReadNoteInput(path="Win.md")))
+        assert data["content"] == "# 見出し\nline\nold mac\nend"
+
+    async def test_read_tags_and_links_skip_code(self, vault_dir):
+        (vault_dir / "Note.md").write_text(
+            "#tag [[Real|alias]] `[[InCode]]`\n```\n#nope [[Fenced]]\n```\n"
+        )
+        data = json.loads(await obsidian_fs_read(ReadNoteInput(path="Note.md")))
+        assert data["tags"] == ["tag"]
+        assert data["wikilinks"] == ["Real"]
+
+    async def test_token_scan_matches_stdlib_re(self, vault_dir, monkeypatch):
+        import re
+        import fs_server
+        text = "#a [[B|b]] `#c` x#d\n```\n[[E]]\n```\n#日本 #f/g [[H]]\n"
+        expected = fs_server._scan_tokens(text)
+        monkeypatch.setattr(
+            fs_server, "NOTE_TOKEN_PATTERN",
+            re.compile(fs_server.NOTE_TOKEN_PATTERN.pattern, re.MULTILINE),
+        )
+        assert fs_server._scan_tokens(text) == expected
+        assert expected == ({"a", "f/g"}, {"B", "H"})
+
 @pytest.mark.asyncio
 class TestFsEdit:
     async def test_append(self, vault_dir):
@@ -84,6 +267,11 @@ class TestFsEdit:
         res = await obsidian_fs_edit(EditNoteInput(path="ReplaceFail.md", operation="replace", find="Universe", content="Python"))
         assert "Error: Text to replace not found" in res
 
+    async def test_invalid_operation_rejected(self, vault_dir):
+        from pydantic import ValidationError
+        with pytest.raises(ValidationError):
+            EditNoteInput(path="Note.md", operation="truncate", content="x")
+
 @pytest.mark.asyncio
 class TestFsDelete:
     async def test_delete_success(self, vault_dir):
@@ -101,15 +289,31 @@ class TestFsDelete:
 @pytest.mark.asyncio
 class TestFsListFolder:
     async def test_list_recursive(self, vault_dir):
-        (vault_dir / "A.md").touch()
+        (vault_dir / "A.md").write_bytes(b"")
         (vault_dir / "Folder").mkdir()
-        (vault_dir / "Folder/B.md").touch()
+        (vault_dir / "Folder/B.md").write_bytes(b"")
         
         res = await obsidian_fs_list_folder(ListFolderInput())
         assert "A" in res
         assert "Folder" in res
         assert "B" in res
 
+    async def test_list_json_structure(self, vault_dir):
+        (vault_dir / "Folder/Sub").mkdir(parents=True)
+        (vault_dir / "Folder/b.md").write_text("")
+        (vault_dir / "Folder/a.txt").write_text("")
+        (vault_dir / "Folder/.hidden.md").write_text("")
+        (vault_dir / "Folder/Sub/c.md").write_text("")
+
+        res = await obsidian_fs_list_folder(ListFolderInput(folder="Folder", response_format="json"))
+        items = json.loads(res)["items"]
+        assert items == [
+            {"type": "folder", "name": "Sub", "path": os.path.join("Folder", "Sub"), "children": [
+                {"type": "note", "name": "c", "path": os.path.join("Folder", "Sub", "c.md")},
+            ]},
+            {"type": "note", "name": "b", "path": os.path.join("Folder", "b.md")},
+        ]
+
 @pytest.mark.asyncio
 class TestFsTags:
     async def test_get_tags(self, vault_dir):
@@ -120,22 +324,41 @@ class TestFsTags:
         assert "#tag1 (2 notes)" in res
         assert "#tag2 (1 notes)" in res
 
+    async def test_tags_skip_code_and_body_tags_lines(self, vault_dir):
+        (vault_dir / "Note.md").write_text(
+            "---\ntags: [fm]\n---\n#real `#inline`\n```\n#fenced\n```\ntags: [body]\n"
+        )
+        (vault_dir / "Stray.md").write_text("a stray ` backtick\nthen #after and `x`\n")
+        res = await obsidian_fs_get_tags(GetTagsInput())
+        assert "#after (1 notes)" in res
+        assert "#fm (1 notes)" in res
+        assert "#real (1 notes)" in res
+        assert "inline" not in res
+        assert "fenced" not in res
+        assert "body" not in res
+
 @pytest.mark.asyncio
 class TestFsBacklinks:
     async def test_get_backlinks(self, vault_dir):
-        (vault_dir / "Target.md").touch()
+        (vault_dir / "Target.md").write_bytes(b"")
         (vault_dir / "Source.md").write_text("Link to [[Target]]")
         
         res = await obsidian_fs_get_backlinks(GetBacklinksInput(note_name="Target"))
         assert "Source" in res
 
+    async def test_backlinks_alias_and_case(self, vault_dir):
+        (vault_dir / "Aliased.md").write_text("See [[target|the target]]")
+        (vault_dir / "Prefix.md").write_text("See [[Target Practice]]")
+        res = await obsidian_fs_get_backlinks(GetBacklinksInput(note_name="Target"))
+        assert "Aliased" in res
+        assert "Prefix" not in res
+
 @pytest.mark.asyncio
 class TestFsDailyNote:
-    async def test_create_daily_default(self, vault_dir):
+    async def test_create_daily_default(self, vault_dir, frozen_today):
         res = await obsidian_fs_daily_note(CreateDailyNoteInput())
-        today = datetime.now().strftime("%Y-%m-%d")
-        assert today in res
-        assert (vault_dir / f"{today}.md").exists()
+        assert frozen_today in res
+        assert (vault_dir / f"{frozen_today}.md").exists()
         
     async def test_create_daily_template(self, vault_dir):
         (vault_dir / "Template.md").write_text("Daily Note: {{date}}")
@@ -144,3 +367,72 @@ class TestFsDailyNote:
         content = (vault_dir / "2099-01-01.md").read_text()
         assert "Daily Note: 2099-01-01" in content
 
+
+@pytest.mark.asyncio
+class TestFsVaultInfo:
+    async def test_vault_info_totals(self, vault_dir):
+        from fs_server import alias_obsidian_vault_info
+        (vault_dir / "A.md").write_text("abc")
+        (vault_dir / "Sub").mkdir()
+        (vault_dir / "Sub/B.md").write_text("de")
+        data = json.loads(await alias_obsidian_vault_info())
+        assert (data["total_notes"], data["total_size_bytes"]) == (2, 5)
+
+    async def test_stats_cached_per_bucket(self, vault_dir):
+        from fs_server import _vault_stats
+        (vault_dir / "A.md").write_text("abc")
+        assert _vault_stats(vault_dir, 1) == (1, 3)
+        (vault_dir / "B.md").write_text("de")
+        assert _vault_stats(vault_dir, 1) == (1, 3)
+        assert _vault_stats(vault_dir, 2) == (2, 5)
+
+@pytest.mark.asyncio
+class TestFsDailyAppend:
+    async def test_append_creates_then_appends(self, vault_dir, frozen_today):
+        from fs_server import alias_obsidian_daily_append, DailyAppendInput
+        data = json.loads(await alias_obsidian_daily_append(DailyAppendInput(content="- first")))
+        assert data["status"] == "edited"
+        note = vault_dir / data["path"]
+        assert note.name == f"{frozen_today}.md"
+        await alias_obsidian_daily_append(DailyAppendInput(content="- 二番目"))
+        assert note.read_text(encoding="utf-8").endswith("\n\n- first\n- 二番目")
+        data = json.loads(await alias_obsidian_daily_append(DailyAppendInput(content="三")))
+        # Byte sizes: a newline plus the three-byte UTF-8 character
+        assert data["new_bytes"] == data["original_bytes"] + 4 == note.stat().st_size
+
+    async def test_append_does_not_decode_note(self, vault_dir):
+        """A note that is not valid UTF-8 is appended to untouched."""
+        from fs_server import alias_obsidian_daily_append, DailyAppendInput
+        data = json.loads(await alias_obsidian_daily_append(DailyAppendInput(content="a")))
+        note = vault_dir / data["path"]
+        note.write_bytes(b"\xff\xfe")
+        data = json.loads(await alias_obsidian_daily_append(DailyAppendInput(content="b")))
+        assert data["original_bytes"] == 2
+        assert note.read_bytes() == b"\xff\xfe\nb"
+
+    async def test_append_inline(self, vault_dir):
+        from fs_server import alias_obsidian_daily_append, DailyAppendInput
+        data = json.loads(await alias_obsidian_daily_append(DailyAppendInput(content="a")))
+        await alias_obsidian_daily_append(DailyAppendInput(content="b", inline=True))
+        assert (vault_dir / data["path"]).read_text(encoding="utf-8").endswith("\nab")
+
+@pytest.mark.asyncio
+async def test_aliases_registered_without_wrappers():
+    from fs_server import mcp
+    tools = {tool.name: tool for tool in await mcp.list_tools()}
+    assert tools["obsidian_tags_list"].inputSchema == tools["obsidian_fs_get_tags"].inputSchema
+    assert mcp._tool_manager.get_tool("obsidian_search").fn is obsidian_fs_search
+
+@pytest.mark.asyncio
+async def test_read_only_tools_run_off_the_event_loop(vault_dir, monkeypatch):
+    import threading
+    import fs_server
+    (vault_dir / "Note.md").write_text("body")
+    seen = []
+    real = fs_server._note_metadata
+    def spy(*args, **kwargs):
+        seen.append(threading.current_thread())
+        return real(*args, **kwargs)
+    monkeypatch.setattr(fs_server, "_note_metadata", spy)
+    await fs_server.mcp.call_tool("obsidian_read", {"params": {"path": "Note.md"}})
+    assert seen and seen[0] is not threading.current_thread()
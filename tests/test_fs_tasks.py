@@ -1,7 +1,6 @@
 """Unit tests for fs_server.py — Tasks support."""
 
 from pathlib import Path
-from unittest.mock import patch, MagicMock
 
 import pytest
 
@@ -14,41 +13,11 @@ from fs_server import (
 )
 
 
-@pytest.fixture
-def mock_vault(tmp_path: Path) -> Path:
-    """Create a temporary vault with sample notes."""
-    # Note 1: Mixed tasks
-    (tmp_path / "Project.md").write_text(
-        "# Project\n\n- [ ] Task 1\n- [x] Task 2\n- [ ] Task 3\nNot a task\n",
-        encoding="utf-8"
-    )
-    # Note 2: Todo only
-    (tmp_path / "Todo.md").write_text(
-        "- [ ] Buy milk\n- [ ] Call Bob\n",
-        encoding="utf-8"
-    )
-    # Note 3: Subfolder
-    sub = tmp_path / "Work"
-    sub.mkdir()
-    (sub / "Meeting.md").write_text(
-        "- [x] Prepare slides\n",
-        encoding="utf-8"
-    )
-    return tmp_path
-
-
-@pytest.fixture
-def mock_vault_path(mock_vault: Path) -> MagicMock:
-    """Mock _vault_path to return tmp_path."""
-    with patch("fs_server._vault_path", return_value=mock_vault) as m:
-        yield m
-
-
 class TestFsTasksList:
     """Tests for obsidian_fs_tasks_list tool."""
 
     @pytest.mark.asyncio
-    async def test_list_all(self, mock_vault_path: MagicMock) -> None:
+    async def test_list_all(self, mock_vault_path: None) -> None:
         """Should list all 5 tasks from all files."""
         result = await obsidian_fs_tasks_list(FsTasksListInput())
         assert "- [ ] Task 1 (Project.md:3)" in result
@@ -58,7 +27,16 @@ class TestFsTasksList:
         assert "6 tasks found" in result
 
     @pytest.mark.asyncio
-    async def test_filter_todo(self, mock_vault_path: MagicMock) -> None:
+    async def test_line_numbers_with_crlf_and_indent(self, mock_vault: Path, mock_vault_path: None) -> None:
+        """Line numbers stay correct for CRLF notes and indented tasks."""
+        (mock_vault / "Crlf.md").write_bytes(b"intro\r\n\r\n\t- [ ] Tabbed\r\n-  [ ] Not a task\r\n- [/] Half\r\n")
+        result = await obsidian_fs_tasks_list(FsTasksListInput())
+        assert "- [ ] Tabbed (Crlf.md:3)" in result
+        assert "- [/] Half (Crlf.md:5)" in result
+        assert "Not a task" not in result
+
+    @pytest.mark.asyncio
+    async def test_filter_todo(self, mock_vault_path: None) -> None:
         """Should list only incomplete tasks."""
         result = await obsidian_fs_tasks_list(FsTasksListInput(todo=True))
         assert "Task 1" in result
@@ -66,14 +44,14 @@ class TestFsTasksList:
         assert "Buy milk" in result
 
     @pytest.mark.asyncio
-    async def test_filter_done(self, mock_vault_path: MagicMock) -> None:
+    async def test_filter_done(self, mock_vault_path: None) -> None:
         """Should list only completed tasks."""
         result = await obsidian_fs_tasks_list(FsTasksListInput(done=True))
         assert "Task 1" not in result
         assert "Task 2" in result
 
     @pytest.mark.asyncio
-    async def test_filter_folder(self, mock_vault_path: MagicMock) -> None:
+    async def test_filter_folder(self, mock_vault_path: None) -> None:
         """Should list tasks only in specified folder."""
         result = await obsidian_fs_tasks_list(FsTasksListInput(folder="Work"))
         assert "Prepare slides" in result
@@ -84,7 +62,7 @@ class TestFsTaskToggle:
     """Tests for obsidian_fs_task_toggle tool."""
 
     @pytest.mark.asyncio
-    async def test_toggle_todo_to_done(self, mock_vault: Path, mock_vault_path: MagicMock) -> None:
+    async def test_toggle_todo_to_done(self, mock_vault: Path, mock_vault_path: None) -> None:
         """Should toggle [ ] to [x]."""
         params = FsTaskToggleInput(path="Project.md", line=3)
         result = await obsidian_fs_task_toggle(params)
@@ -94,7 +72,7 @@ class TestFsTaskToggle:
         assert "- [x] Task 1" in content
 
     @pytest.mark.asyncio
-    async def test_toggle_done_to_todo(self, mock_vault: Path, mock_vault_path: MagicMock) -> None:
+    async def test_toggle_done_to_todo(self, mock_vault: Path, mock_vault_path: None) -> None:
         """Should toggle [x] to [ ]."""
         params = FsTaskToggleInput(path="Project.md", line=4)
         result = await obsidian_fs_task_toggle(params)
@@ -104,15 +82,84 @@ class TestFsTaskToggle:
         assert "- [ ] Task 2" in content
 
     @pytest.mark.asyncio
-    async def test_toggle_invalid_line(self, mock_vault_path: MagicMock) -> None:
+    async def test_toggle_invalid_line(self, mock_vault_path: None) -> None:
         """Should return error if line is not a task."""
         params = FsTaskToggleInput(path="Project.md", line=1)  # Heading line
         result = await obsidian_fs_task_toggle(params)
         assert "Error: Line 1 in Project.md is not a task" in result
 
     @pytest.mark.asyncio
-    async def test_toggle_not_found(self, mock_vault_path: MagicMock) -> None:
+    async def test_toggle_preserves_line_endings(self, mock_vault: Path, mock_vault_path: None) -> None:
+        """Should only change the status character, keeping CRLF and the final newline."""
+        (mock_vault / "Crlf.md").write_bytes(b"# Title\r\n  - [ ] Nested task\r\n")
+        result = await obsidian_fs_task_toggle(FsTaskToggleInput(path="Crlf.md", line=2))
+        assert "to [x]" in result
+        assert (mock_vault / "Crlf.md").read_bytes() == b"# Title\r\n  - [x] Nested task\r\n"
+
+    @pytest.mark.asyncio
+    async def test_toggle_line_past_end(self, mock_vault_path: None) -> None:
+        """Should report the line count, not counting the final newline as a line."""
+        result = await obsidian_fs_task_toggle(FsTaskToggleInput(path="Todo.md", line=3))
+        assert "exceeds file length (2 lines)" in result
+
+    @pytest.mark.asyncio
+    async def test_toggle_multibyte_status(self, mock_vault: Path, mock_vault_path: None) -> None:
+        """A multibyte status symbol is replaced and the rest of the file shifted intact."""
+        (mock_vault / "Custom.md").write_text("- [✓] 完了 task\n- [ ] next", encoding="utf-8")
+        result = await obsidian_fs_task_toggle(FsTaskToggleInput(path="Custom.md", line=1))
+        assert "to [ ]" in result
+        assert (mock_vault / "Custom.md").read_text(encoding="utf-8") == "- [ ] 完了 task\n- [ ] next"
+
+    @pytest.mark.asyncio
+    async def test_toggle_last_line_without_newline(self, mock_vault: Path, mock_vault_path: None) -> None:
+        """The final line is found even without a trailing newline."""
+        (mock_vault / "NoEol.md").write_bytes(b"text\n- [ ] last")
+        result = await obsidian_fs_task_toggle(FsTaskToggleInput(path="NoEol.md", line=2))
+        assert "to [x]" in result
+        assert (mock_vault / "NoEol.md").read_bytes() == b"text\n- [x] last"
+        result = await obsidian_fs_task_toggle(FsTaskToggleInput(path="NoEol.md", line=3))
+        assert "exceeds file length (2 lines)" in result
+
+    @pytest.mark.asyncio
+    async def test_toggle_empty_file(self, mock_vault: Path, mock_vault_path: None) -> None:
+        """An empty note has no lines to toggle."""
+        (mock_vault / "Empty.md").write_bytes(b"")
+        result = await obsidian_fs_task_toggle(FsTaskToggleInput(path="Empty.md", line=1))
+        assert "exceeds file length (0 lines)" in result
+
+    @pytest.mark.asyncio
+    async def test_toggle_not_found(self, mock_vault_path: None) -> None:
         """Should return error if file not found."""
         params = FsTaskToggleInput(path="NonExistent.md", line=1)
         result = await obsidian_fs_task_toggle(params)
         assert "Error: Note not found" in result
+
+    @pytest.mark.asyncio
+    async def test_toggle_cr_only_matches_tasks_list(self, mock_vault: Path, mock_vault_path: None) -> None:
+        """A line number reported by tasks_list for a CR-only note toggles that same task."""
+        (mock_vault / "OldMac.md").write_bytes(b"intro\r- [ ] first\r\r- [ ] second\r")
+        listed = await obsidian_fs_tasks_list(FsTasksListInput())
+        assert "- [ ] second (OldMac.md:4)" in listed
+        result = await obsidian_fs_task_toggle(FsTaskToggleInput(path="OldMac.md", line=4))
+        assert "to [x]" in result
+        assert (mock_vault / "OldMac.md").read_bytes() == b"intro\r- [ ] first\r\r- [x] second\r"
+
+    @pytest.mark.asyncio
+    async def test_toggle_patches_in_place(self, mock_vault: Path, mock_vault_path: None) -> None:
+        """A same-width status is written into the existing file, so hardlinks stay shared."""
+        note = mock_vault / "Todo.md"
+        link = mock_vault / "Linked.md"
+        link.hardlink_to(note)
+        await obsidian_fs_task_toggle(FsTaskToggleInput(path="Todo.md", line=2))
+        assert link.read_bytes() == b"- [ ] Buy milk\n- [x] Call Bob\n"
+        assert link.stat().st_ino == note.stat().st_ino
+
+    @pytest.mark.asyncio
+    async def test_toggle_multibyte_status_replaces_atomically(self, mock_vault: Path, mock_vault_path: None) -> None:
+        """A status of another width is swapped in via a temp file, which is not left behind."""
+        note = mock_vault / "Custom.md"
+        note.write_text("- [✓] done\n", encoding="utf-8")
+        inode = note.stat().st_ino
+        await obsidian_fs_task_toggle(FsTaskToggleInput(path="Custom.md", line=1))
+        assert note.stat().st_ino != inode
+        assert not list(mock_vault.glob(".Custom.md.*"))
@@ -1,7 +1,5 @@
 """Unit tests for server.py — All 8 MCP tools for Obsidian CLI."""
 
-from unittest.mock import patch, AsyncMock
-
 import pytest
 
 from server import (
@@ -23,6 +21,7 @@ from server import (
 )
 
 from cli import ObsidianCLIError
+from fakes import FakeRunObsidian
 
 
 # ---------------------------------------------------------------------------
@@ -34,26 +33,23 @@ class TestDailyRead:
     """Tests for obsidian_daily_read tool."""
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_basic(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = "# 2025-02-11\n\nMy note"
+    async def test_basic(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = "# 2025-02-11\n\nMy note"
         params = VaultMixin()
         result = await obsidian_daily_read(params)
         assert result == "# 2025-02-11\n\nMy note"
-        mock_cli.assert_called_once_with("daily:read")
+        assert cli.calls == [(("daily:read",), {})]
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_with_vault(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = "content"
+    async def test_with_vault(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = "content"
         params = VaultMixin(vault="MyVault")
         await obsidian_daily_read(params)
-        mock_cli.assert_called_once_with("daily:read", vault="MyVault")
+        assert cli.calls == [(("daily:read",), {"vault": "MyVault"})]
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_error(self, mock_cli: AsyncMock) -> None:
-        mock_cli.side_effect = ObsidianCLIError("no vault", returncode=1, stderr="no vault")
+    async def test_error(self, cli: FakeRunObsidian) -> None:
+        cli.exc = ObsidianCLIError("no vault", returncode=1, stderr="no vault")
         params = VaultMixin()
         result = await obsidian_daily_read(params)
         assert "Error" in result
@@ -64,27 +60,24 @@ class TestDailyAppend:
     """Tests for obsidian_daily_append tool."""
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_basic(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = ""
+    async def test_basic(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = ""
         params = DailyAppendInput(content="Hello world")
         result = await obsidian_daily_append(params)
         assert result == "Content appended to daily note."
-        mock_cli.assert_called_once_with("daily:append", "content=Hello world", "silent")
+        assert cli.calls == [(("daily:append", "content=Hello world", "silent"), {})]
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_inline(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = ""
+    async def test_inline(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = ""
         params = DailyAppendInput(content="inline text", inline=True)
         await obsidian_daily_append(params)
-        args = mock_cli.call_args[0]
+        args = cli.calls[-1][0]
         assert "inline" in args
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_error(self, mock_cli: AsyncMock) -> None:
-        mock_cli.side_effect = ObsidianCLIError("write fail")
+    async def test_error(self, cli: FakeRunObsidian) -> None:
+        cli.exc = ObsidianCLIError("write fail")
         params = DailyAppendInput(content="test")
         result = await obsidian_daily_append(params)
         assert "Error" in result
@@ -99,49 +92,52 @@ class TestTasksList:
     """Tests for obsidian_tasks_list tool."""
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_default(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = "- [ ] Task 1\n- [x] Task 2"
+    async def test_default(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = "- [ ] Task 1\n- [x] Task 2"
         params = TasksListInput()
         result = await obsidian_tasks_list(params)
         assert "Task 1" in result
-        args = mock_cli.call_args[0]
+        args = cli.calls[-1][0]
         assert "tasks" in args
         assert "verbose" in args
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_filters(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = "tasks"
+    async def test_filters(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = "tasks"
         params = TasksListInput(file="Recipe.md", todo=True, all_vault=True)
         await obsidian_tasks_list(params)
-        args = mock_cli.call_args[0]
+        args = cli.calls[-1][0]
         assert "file=Recipe.md" in args
         assert "todo" in args
         assert "all" in args
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_daily_done_flags(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = "tasks"
+    async def test_daily_done_flags(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = "tasks"
         params = TasksListInput(daily=True, done=True)
         await obsidian_tasks_list(params)
-        args = mock_cli.call_args[0]
+        args = cli.calls[-1][0]
         assert "daily" in args
         assert "done" in args
 
+    @pytest.mark.asyncio
+    async def test_flag_order(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = "tasks"
+        params = TasksListInput(file="A.md", all_vault=True, daily=True, todo=True, done=True)
+        await obsidian_tasks_list(params)
+        assert cli.calls == [(("tasks", "file=A.md", "all", "daily", "todo", "done", "verbose"), {})]
+
 
 class TestTaskToggle:
     """Tests for obsidian_task_toggle tool."""
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_toggle(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = "toggled"
+    async def test_toggle(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = "toggled"
         params = TaskToggleInput(ref="Recipe.md:8")
         result = await obsidian_task_toggle(params)
         assert result == "toggled"
-        mock_cli.assert_called_once_with("task", "ref=Recipe.md:8", "toggle")
+        assert cli.calls == [(("task", "ref=Recipe.md:8", "toggle"), {})]
 
 
 # ---------------------------------------------------------------------------
@@ -153,24 +149,22 @@ class TestSearch:
     """Tests for obsidian_search tool."""
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_basic(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = "found 3 results"
+    async def test_basic(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = "found 3 results"
         params = SearchInput(query="python")
         result = await obsidian_search(params)
         assert "found" in result
-        args = mock_cli.call_args[0]
+        args = cli.calls[-1][0]
         assert "search" in args
         assert "query=python" in args
         assert "matches" in args
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_with_options(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = "results"
+    async def test_with_options(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = "results"
         params = SearchInput(query="test", path="notes/", limit=5, matches=False)
         await obsidian_search(params)
-        args = mock_cli.call_args[0]
+        args = cli.calls[-1][0]
         assert "path=notes/" in args
         assert "limit=5" in args
         assert "matches" not in args
@@ -185,35 +179,32 @@ class TestTagsList:
     """Tests for obsidian_tags_list tool."""
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_list(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = "#python (5)\n#rust (3)"
+    async def test_list(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = "#python (5)\n#rust (3)"
         params = TagsListInput()
         result = await obsidian_tags_list(params)
         assert "#python" in result
-        mock_cli.assert_called_once_with("tags", "all", "counts")
+        assert cli.calls == [(("tags", "all", "counts"), {})]
 
 
 class TestTagInfo:
     """Tests for obsidian_tag_info tool."""
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_basic(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = "tag details"
+    async def test_basic(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = "tag details"
         params = TagInfoInput(name="python")
         result = await obsidian_tag_info(params)
         assert result == "tag details"
-        mock_cli.assert_called_once_with("tag", "name=python", "verbose")
+        assert cli.calls == [(("tag", "name=python", "verbose"), {})]
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_strip_hash(self, mock_cli: AsyncMock) -> None:
+    async def test_strip_hash(self, cli: FakeRunObsidian) -> None:
         """Leading # should be stripped from tag name."""
-        mock_cli.return_value = "tag details"
+        cli.return_value = "tag details"
         params = TagInfoInput(name="#python")
         await obsidian_tag_info(params)
-        mock_cli.assert_called_once_with("tag", "name=python", "verbose")
+        assert cli.calls == [(("tag", "name=python", "verbose"), {})]
 
 
 # ---------------------------------------------------------------------------
@@ -225,21 +216,19 @@ class TestVaultInfo:
     """Tests for obsidian_vault_info tool."""
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_basic(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = "Vault: MyVault\nPath: /home/user/vault"
+    async def test_basic(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = "Vault: MyVault\nPath: /home/user/vault"
         params = VaultMixin()
         result = await obsidian_vault_info(params)
         assert "MyVault" in result
-        mock_cli.assert_called_once_with("vault")
+        assert cli.calls == [(("vault",), {})]
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_with_vault(self, mock_cli: AsyncMock) -> None:
-        mock_cli.return_value = "info"
+    async def test_with_vault(self, cli: FakeRunObsidian) -> None:
+        cli.return_value = "info"
         params = VaultMixin(vault="Work")
         await obsidian_vault_info(params)
-        mock_cli.assert_called_once_with("vault", vault="Work")
+        assert cli.calls == [(("vault",), {"vault": "Work"})]
 
 
 # ---------------------------------------------------------------------------
@@ -247,26 +236,29 @@ class TestVaultInfo:
 # ---------------------------------------------------------------------------
 
 
+TOOLS_AND_PARAMS = [
+    (obsidian_daily_read, VaultMixin()),
+    (obsidian_daily_append, DailyAppendInput(content="x")),
+    (obsidian_tasks_list, TasksListInput()),
+    (obsidian_task_toggle, TaskToggleInput(ref="test.md:1")),
+    (obsidian_search, SearchInput(query="test")),
+    (obsidian_tags_list, TagsListInput()),
+    (obsidian_tag_info, TagInfoInput(name="test")),
+    (obsidian_vault_info, VaultMixin()),
+]
+
+
 class TestErrorHandling:
     """Verify all tools gracefully handle ObsidianCLIError."""
 
     @pytest.mark.asyncio
-    @patch("server.run_obsidian_async", new_callable=AsyncMock)
-    async def test_all_tools_return_error_string(self, mock_cli: AsyncMock) -> None:
+    @pytest.mark.parametrize(
+        "tool_fn,params", TOOLS_AND_PARAMS, ids=[fn.__name__ for fn, _ in TOOLS_AND_PARAMS]
+    )
+    async def test_tool_returns_error_string(self, cli: FakeRunObsidian, tool_fn, params) -> None:
         """Every tool should return an error string, not raise."""
-        tools_and_params = [
-            (obsidian_daily_read, VaultMixin()),
-            (obsidian_daily_append, DailyAppendInput(content="x")),
-            (obsidian_tasks_list, TasksListInput()),
-            (obsidian_task_toggle, TaskToggleInput(ref="test.md:1")),
-            (obsidian_search, SearchInput(query="test")),
-            (obsidian_tags_list, TagsListInput()),
-            (obsidian_tag_info, TagInfoInput(name="test")),
-            (obsidian_vault_info, VaultMixin()),
-        ]
-        for tool_fn, params in tools_and_params:
-            mock_cli.reset_mock()
-            mock_cli.side_effect = ObsidianCLIError("CLI crashed", returncode=1, stderr="CLI crashed")
-            result = await tool_fn(params)
-            assert isinstance(result, str), f"{tool_fn.__name__} did not return str"
-            assert "Error" in result, f"{tool_fn.__name__} missing 'Error' in response"
+        cli.exc = ObsidianCLIError("CLI crashed", returncode=1, stderr="CLI crashed")
+        result = await tool_fn(params)
+        assert isinstance(result, str)
+        assert "Error" in result
+        assert len(cli.calls) == 1
@@ -0,0 +1,214 @@
+"""Tests for the persistent note index (vault_index.py) and its use in fs_server."""
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+import fs_server
+from fs_server import (
+    obsidian_fs_get_backlinks, obsidian_fs_get_tags, obsidian_fs_search,
+    GetBacklinksInput, GetTagsInput, SearchNotesInput,
+)
+from vault_index import NoteIndex, SCHEMA_VERSION, index_path
+
+
+@pytest.fixture
+def vault(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """A small vault exposed through OBSIDIAN_VAULT_PATH."""
+    (tmp_path / ".obsidian").mkdir()
+    (tmp_path / "A.md").write_text("#alpha links to [[B]]", encoding="utf-8")
+    (tmp_path / "B.md").write_text("#beta", encoding="utf-8")
+    monkeypatch.setenv("OBSIDIAN_VAULT_PATH", str(tmp_path))
+    fs_server._vault_path.cache_clear()
+    yield tmp_path
+    fs_server._vault_path.cache_clear()
+
+
+class TestNoteIndex:
+    """Tests for NoteIndex lookup/store/prune."""
+
+    def test_linking_to_is_case_insensitive(self, vault: Path) -> None:
+        notes = [vault / "A.md", vault / "B.md"]
+        with NoteIndex(vault) as index:
+            _, stale = index.lookup(notes)
+            index.store((p, st, ([], ["Target", "target"] if p.name == "A.md" else []), "{}") for p, st in stale)
+            assert index.linking_to("TARGET") == ["A.md"]
+
+    def test_unchanged_notes_are_fresh(self, vault: Path) -> None:
+        notes = [vault / "A.md", vault / "B.md"]
+        with NoteIndex(vault) as index:
+            fresh, stale = index.lookup(notes)
+            assert fresh == {}
+            index.store((p, st, (["t"], ["l"]), "{}") for p, st in stale)
+        with NoteIndex(vault) as index:
+            fresh, stale = index.lookup(notes)
+        assert stale == []
+        assert fresh[vault / "A.md"] == (["t"], ["l"])
+
+    def test_modified_note_is_stale(self, vault: Path) -> None:
+        note = vault / "A.md"
+        with NoteIndex(vault) as index:
+            _, stale = index.lookup([note])
+            index.store((p, st, ([], []), "{}") for p, st in stale)
+        note.write_text("#alpha and more", encoding="utf-8")
+        with NoteIndex(vault) as index:
+            fresh, stale = index.lookup([note])
+        assert fresh == {}
+        assert [p for p, _ in stale] == [note]
+
+    def test_prune_drops_deleted_notes(self, vault: Path) -> None:
+        notes = [vault / "A.md", vault / "B.md"]
+        with NoteIndex(vault) as index:
+            _, stale = index.lookup(notes)
+            index.store((p, st, ([], []), "{}") for p, st in stale)
+            index.prune(notes[:1])
+        conn = sqlite3.connect(index_path(vault))
+        assert [r[0] for r in conn.execute("SELECT path FROM notes")] == ["A.md"]
+        conn.close()
+
+    def test_frontmatter_served_until_modified(self, vault: Path) -> None:
+        note = vault / "A.md"
+        with NoteIndex(vault) as index:
+            fresh, stale = index.frontmatter([note])
+            assert fresh == {}
+            index.store((p, st, ([], []), '{"status":"draft"}') for p, st in stale)
+            fresh, stale = index.frontmatter([note, vault / "Missing.md"])
+        assert fresh == {note: {"status": "draft"}} and stale == []
+        note.write_text("changed", encoding="utf-8")
+        with NoteIndex(vault) as index:
+            fresh, stale = index.frontmatter([note])
+        assert fresh == {} and [p for p, _ in stale] == [note]
+
+    def test_schema_mismatch_rebuilds(self, vault: Path) -> None:
+        conn = sqlite3.connect(index_path(vault))
+        conn.execute("CREATE TABLE notes (path TEXT)")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 100}")
+        conn.commit()
+        conn.close()
+        with NoteIndex(vault) as index:
+            fresh, stale = index.lookup([vault / "A.md"])
+        assert fresh == {} and len(stale) == 1
+
+    def test_failed_rebuild_leaves_old_schema(self, vault: Path) -> None:
+        conn = sqlite3.connect(index_path(vault))
+        conn.execute("CREATE TABLE notes (path TEXT)")
+        # An index of that name on another table makes the rebuild fail midway
+        conn.execute("CREATE TABLE other (x TEXT)")
+        conn.execute("CREATE INDEX backlinks_target ON other (x)")
+        conn.execute("PRAGMA user_version = 1")
+        conn.commit()
+        conn.close()
+        with pytest.raises(sqlite3.OperationalError):
+            NoteIndex(vault)
+        conn = sqlite3.connect(index_path(vault))
+        assert conn.execute("PRAGMA user_version").fetchone() == (1,)
+        assert conn.execute("SELECT sql FROM sqlite_master WHERE name = 'notes'").fetchone() == (
+            "CREATE TABLE notes (path TEXT)",
+        )
+        conn.close()
+
+    def test_plain_folder_is_not_indexed(self, vault: Path) -> None:
+        (vault / ".obsidian").rmdir()
+        with pytest.raises(OSError):
+            NoteIndex(vault)
+        assert not (vault / ".obsidian").exists()
+
+
+@pytest.mark.asyncio
+class TestIndexedTools:
+    """The vault-wide tools stay correct across index hits and misses."""
+
+    async def test_tags_follow_edits(self, vault: Path) -> None:
+        assert "#alpha (1 notes)" in await obsidian_fs_get_tags(GetTagsInput())
+        assert index_path(vault).exists()
+        (vault / "A.md").write_text("#gamma only", encoding="utf-8")
+        res = await obsidian_fs_get_tags(GetTagsInput())
+        assert "#gamma (1 notes)" in res
+        assert "#alpha" not in res
+
+    async def test_backlinks_use_index(self, vault: Path) -> None:
+        assert "A" in await obsidian_fs_get_backlinks(GetBacklinksInput(note_name="b"))
+        # Served from the index on the second call
+        assert "A" in await obsidian_fs_get_backlinks(GetBacklinksInput(note_name="B"))
+
+    async def test_backlinks_follow_edits_and_deletes(self, vault: Path) -> None:
+        (vault / "C.md").write_text("also [[b|Bee]]", encoding="utf-8")
+        res = await obsidian_fs_get_backlinks(GetBacklinksInput(note_name="B"))
+        assert "(2 found)" in res
+        (vault / "A.md").write_text("no links any more", encoding="utf-8")
+        (vault / "C.md").unlink()
+        res = await obsidian_fs_get_backlinks(GetBacklinksInput(note_name="B"))
+        assert res == "No backlinks found for 'B'."
+        with NoteIndex(vault) as index:
+            assert index.linking_to("b") == []
+
+    async def test_unreadable_note_drops_its_backlinks(self, vault: Path) -> None:
+        assert "A" in await obsidian_fs_get_backlinks(GetBacklinksInput(note_name="B"))
+        (vault / "A.md").write_bytes(b"\xff links to [[B]]")
+        res = await obsidian_fs_get_backlinks(GetBacklinksInput(note_name="B"))
+        assert res == "No backlinks found for 'B'."
+        with NoteIndex(vault) as index:
+            assert index.linking_to("b") == []
+            fresh, stale = index.lookup([vault / "A.md"])
+        assert fresh == {}
+
+    async def test_search_frontmatter_from_index(self, vault: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        if fs_server.frontmatter is None:
+            pytest.skip("python-frontmatter not installed")
+        (vault / "Fm.md").write_text("---\nstatus: draft\ncreated: 2024-01-02\n---\nneedle", encoding="utf-8")
+        params = SearchNotesInput(query="needle", response_format="json")
+        first = json.loads(await obsidian_fs_search(params))
+        assert first["results"][0]["frontmatter"] == {"status": "draft", "created": "2024-01-02"}
+        # Unchanged notes are not parsed again
+        monkeypatch.setattr(fs_server, "frontmatter", None)
+        assert json.loads(await obsidian_fs_search(params)) == first
+
+    async def test_backlinks_fall_back_when_index_unavailable(self, vault: Path) -> None:
+        (vault / ".obsidian").rmdir()
+        (vault / ".obsidian").write_text("", encoding="utf-8")
+        res = await obsidian_fs_get_backlinks(GetBacklinksInput(note_name="B"))
+        assert "**A**" in res
+
+    async def test_falls_back_when_index_unavailable(self, vault: Path) -> None:
+        # A regular file where the .obsidian directory should be
+        (vault / ".obsidian").rmdir()
+        (vault / ".obsidian").write_text("", encoding="utf-8")
+        res = await obsidian_fs_get_tags(GetTagsInput())
+        assert "#alpha (1 notes)" in res
+        assert "#beta (1 notes)" in res
+
+    async def test_tools_work_without_obsidian_dir(self, vault: Path) -> None:
+        (vault / ".obsidian").rmdir()
+        assert "#alpha (1 notes)" in await obsidian_fs_get_tags(GetTagsInput())
+        assert "**A**" in await obsidian_fs_get_backlinks(GetBacklinksInput(note_name="B"))
+        assert not (vault / ".obsidian").exists()
+
+    async def test_plain_folder_fallback_is_quiet(self, vault: Path, caplog: pytest.LogCaptureFixture) -> None:
+        """A folder without .obsidian is a normal case, not worth a warning per call."""
+        (vault / ".obsidian").rmdir()
+        with caplog.at_level("DEBUG", logger=fs_server.logger.name):
+            assert "#alpha (1 notes)" in await obsidian_fs_get_tags(GetTagsInput())
+        assert [r.levelname for r in caplog.records] == ["DEBUG"]
+
+    async def test_index_error_still_warns(self, vault: Path, caplog: pytest.LogCaptureFixture) -> None:
+        index_path(vault).write_bytes(b"not a database" * 100)
+        assert "#alpha (1 notes)" in await obsidian_fs_get_tags(GetTagsInput())
+        assert any(r.levelname == "WARNING" for r in caplog.records)
+
+    async def test_frontmatter_skips_index_without_hits(
+        self, vault: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A search with no hits does not open the index."""
+        monkeypatch.setattr(fs_server, "NoteIndex", None)
+        assert fs_server._indexed_frontmatter(vault, []) == {}
+
+    async def test_search_frontmatter_without_index(self, vault: Path) -> None:
+        if fs_server.frontmatter is None:
+            pytest.skip("python-frontmatter not installed")
+        (vault / ".obsidian").rmdir()
+        (vault / ".obsidian").write_text("", encoding="utf-8")
+        (vault / "Fm.md").write_text("---\nstatus: draft\n---\nneedle", encoding="utf-8")
+        res = json.loads(await obsidian_fs_search(SearchNotesInput(query="needle", response_format="json")))
+        assert res["results"][0]["frontmatter"] == {"status": "draft"}
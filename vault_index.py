@@ -0,0 +1,195 @@
+"""Persistent per-note metadata index for the filesystem MCP server.
+
+Stores the tags, wikilinks and frontmatter of every scanned note in a
+SQLite file under the vault's .obsidian directory, keyed by (mtime_ns, size).
+Vault-wide tools then only read and parse notes that changed since the
+previous call. A backlinks table inverts the wikilinks so "who links to X"
+is one indexed query. Folders without an .obsidian directory get no index,
+since creating one would make Obsidian treat them as a vault.
+"""
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+INDEX_FILENAME = "fs_mcp_index.sqlite"
+# Bump when the stored fields or the way they are extracted change;
+# a mismatching index is dropped and rebuilt on open.
+SCHEMA_VERSION = 7
+
+# (tags, wikilinks) as extracted from one note
+NoteData = Tuple[List[str], List[str]]
+
+
+def index_path(vault: Path) -> Path:
+    """Return the location of the index file for a vault."""
+    return vault / ".obsidian" / INDEX_FILENAME
+
+
+class NoteIndex:
+    """SQLite-backed cache of note metadata, keyed by vault-relative path."""
+
+    def __init__(self, vault: Path):
+        self.vault = vault
+        db_path = index_path(vault)
+        if not db_path.parent.is_dir():
+            raise FileNotFoundError(f"No .obsidian directory in {vault}; not indexing a non-vault folder")
+        self._conn = sqlite3.connect(str(db_path), timeout=5)
+        try:
+            self._ensure_schema()
+        except BaseException:
+            self._conn.close()
+            raise
+
+    def __enter__(self) -> "NoteIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _ensure_schema(self) -> None:
+        (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if version == SCHEMA_VERSION:
+            return
+        # sqlite3 does not open implicit transactions for DDL, so take the
+        # write lock explicitly: the rebuild is all-or-nothing, and a second
+        # server opening the index meanwhile waits and sees the new version.
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            (version,) = self._conn.execute("PRAGMA user_version").fetchone()
+            if version != SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS notes")
+                self._conn.execute("DROP TABLE IF EXISTS backlinks")
+                self._conn.execute(
+                    "CREATE TABLE notes ("
+                    "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, "
+                    "tags TEXT, wikilinks TEXT, frontmatter TEXT)"
+                )
+                # target is the lower-cased link text, source the linking note's path
+                self._conn.execute("CREATE TABLE backlinks (target TEXT NOT NULL, source TEXT NOT NULL)")
+                self._conn.execute("CREATE INDEX backlinks_target ON backlinks (target)")
+                self._conn.execute("CREATE INDEX backlinks_source ON backlinks (source)")
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def lookup(
+        self, notes: Iterable[Path], load: bool = True
+    ) -> Tuple[Dict[Path, NoteData], List[Tuple[Path, os.stat_result]]]:
+        """Split notes into cached entries and ones that must be re-parsed.
+
+        Returns (fresh, stale): fresh maps path -> (tags, wikilinks) for notes
+        whose mtime and size match the index; stale lists (path, stat) for
+        the rest. Notes that vanished since listing are left out of both.
+        With load=False only staleness is checked and fresh stays empty.
+        """
+        rows = {
+            path: (mtime_ns, size, tags, links)
+            for path, mtime_ns, size, tags, links in self._conn.execute(
+                "SELECT path, mtime_ns, size, tags, wikilinks FROM notes"
+            )
+        }
+        fresh: Dict[Path, NoteData] = {}
+        stale: List[Tuple[Path, os.stat_result]] = []
+        for note_path in notes:
+            try:
+                st = note_path.stat()
+            except OSError:
+                continue
+            row = rows.get(str(note_path.relative_to(self.vault)))
+            if row and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+                if load:
+                    fresh[note_path] = (json.loads(row[2]), json.loads(row[3]))
+            else:
+                stale.append((note_path, st))
+        return fresh, stale
+
+    def frontmatter(
+        self, notes: Iterable[Path]
+    ) -> Tuple[Dict[Path, Dict[str, Any]], List[Tuple[Path, os.stat_result]]]:
+        """Split notes into cached frontmatter and ones that must be re-parsed.
+
+        Like lookup, but returns the stored frontmatter of the fresh notes
+        and only queries the rows of the given notes, for callers that need
+        a few notes rather than the whole vault.
+        """
+        fresh: Dict[Path, Dict[str, Any]] = {}
+        stale: List[Tuple[Path, os.stat_result]] = []
+        for note_path in notes:
+            try:
+                st = note_path.stat()
+            except OSError:
+                continue
+            row = self._conn.execute(
+                "SELECT mtime_ns, size, frontmatter FROM notes WHERE path = ?",
+                (str(note_path.relative_to(self.vault)),),
+            ).fetchone()
+            if row and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+                fresh[note_path] = json.loads(row[2])
+            else:
+                stale.append((note_path, st))
+        return fresh, stale
+
+    def store(self, entries: Iterable[Tuple[Path, os.stat_result, NoteData, str]]) -> None:
+        """Insert or update the given notes and their backlinks in one transaction.
+
+        Each entry is (path, stat, (tags, wikilinks), frontmatter JSON). The
+        frontmatter is stored as already serialized by the caller, so cached
+        values come back exactly as a fresh parse would have been rendered.
+        The stat must be taken before the note was read, so a concurrent
+        edit leaves a mismatching key and is re-parsed next time.
+        """
+        rows = []
+        links = []
+        for note_path, st, (note_tags, note_links), note_frontmatter in entries:
+            rel = str(note_path.relative_to(self.vault))
+            rows.append((
+                rel,
+                st.st_mtime_ns,
+                st.st_size,
+                json.dumps(note_tags, ensure_ascii=False),
+                json.dumps(note_links, ensure_ascii=False),
+                note_frontmatter,
+            ))
+            links.extend((target, rel) for target in {link.lower() for link in note_links})
+        if not rows:
+            return
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO notes VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._conn.executemany("DELETE FROM backlinks WHERE source = ?", [(row[0],) for row in rows])
+            self._conn.executemany("INSERT INTO backlinks VALUES (?, ?)", links)
+
+    def prune(self, notes: Iterable[Path]) -> None:
+        """Drop rows for notes that are no longer in the vault."""
+        keep = {str(p.relative_to(self.vault)) for p in notes}
+        self._delete([
+            (path,)
+            for (path,) in self._conn.execute("SELECT path FROM notes")
+            if path not in keep
+        ])
+
+    def remove(self, notes: Iterable[Path]) -> None:
+        """Drop the rows of the given notes, e.g. ones that can no longer be read."""
+        self._delete([(str(p.relative_to(self.vault)),) for p in notes])
+
+    def _delete(self, paths: List[Tuple[str]]) -> None:
+        if paths:
+            with self._conn:
+                self._conn.executemany("DELETE FROM notes WHERE path = ?", paths)
+                self._conn.executemany("DELETE FROM backlinks WHERE source = ?", paths)
+
+    def linking_to(self, target: str) -> List[str]:
+        """Return vault-relative paths of notes with a [[target]] link (case-insensitive)."""
+        return [
+            source
+            for (source,) in self._conn.execute(
+                "SELECT source FROM backlinks WHERE target = ?", (target.lower(),)
+            )
+        ]